@@ -0,0 +1,269 @@
+# bench.py
+# ------------------------------------------------------------
+# Per-stage benchmarks for the gesture pipeline
+# ------------------------------------------------------------
+# Synthetic frames + fake landmark streams, no camera or MIDI
+# hardware needed. Prints a table to stderr and JSON to stdout
+# (or --out FILE) so results can be diffed between commits.
+#
+# Run with: python bench.py [--quick] [--out bench.json]
+# ------------------------------------------------------------
+
+import os
+os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import sys
+import time
+import numpy as np
+import cv2
+import websockets
+import gestures
+import run_time
+from sinks import NullSink
+from io_bridge import Bridge
+
+
+class NullPort:
+    """mido-style output port that discards everything."""
+    name = "null"
+
+    def send(self, msg):
+        pass
+
+    def close(self):
+        pass
+
+
+# ------------------------------------------------------------
+# Timing helpers
+# ------------------------------------------------------------
+def summarize(samples_ns):
+    s = np.asarray(samples_ns, dtype=np.float64) / 1e3   # -> microseconds
+    total = s.sum() / 1e6
+    return {
+        "n": int(len(s)),
+        "ops_per_sec": round(len(s) / total, 1) if total > 0 else 0.0,
+        "p50_us": round(float(np.percentile(s, 50)), 2),
+        "p99_us": round(float(np.percentile(s, 99)), 2),
+        "max_us": round(float(s.max()), 2),
+    }
+
+
+def measure(fn, n, warmup=10):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter_ns()
+        fn()
+        samples.append(time.perf_counter_ns() - t0)
+    return summarize(samples)
+
+
+# ------------------------------------------------------------
+# Synthetic inputs
+# ------------------------------------------------------------
+def synthetic_frame(w=1080, h=420, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 255, (h, w, 3), dtype=np.uint8)
+
+
+def fake_hand(cx, cy, scale=120.0, extended=(1, 1, 1, 1, 1), label="Right"):
+    """21 pixel-space landmarks for a roughly upright hand."""
+    pts = np.zeros((21, 3))
+    pts[0] = (cx, cy + scale, 0)
+    bases = [-0.6, -0.3, 0.0, 0.3, 0.6]
+    for f, (dx, up) in enumerate(zip(bases, extended)):
+        for j in range(4):
+            k = 1 + f * 4 + j
+            reach = (j + 1) / 4 * (1.0 if up else 0.35)
+            y = cy + scale * (0.3 - reach)
+            if not up and j >= 2:   # curl the tip back down below the PIP joint
+                y = cy + scale * 0.2
+            pts[k] = (cx + dx * scale, y, -0.01 * j)
+    # thumb points outward when extended
+    side = 1 if label == "Right" else -1
+    pts[4, 0] = pts[3, 0] + side * (20 if extended[0] else -20)
+    return pts
+
+
+def landmark_stream(n_frames, seed=0):
+    """Both hands drifting around, cycling through a few poses."""
+    rng = np.random.default_rng(seed)
+    poses = [(0, 0, 0, 0, 0), (1, 1, 1, 1, 1), (1, 0, 0, 0, 1), (0, 1, 1, 0, 0), (0, 1, 0, 0, 0)]
+    labels = ["Left", "Right"]
+    for i in range(n_frames):
+        pose = poses[(i // 15) % len(poses)]
+        pts = np.stack([
+            fake_hand(300 + 40 * np.sin(i / 7), 200 + rng.normal(0, 3), extended=pose, label="Left"),
+            fake_hand(780 + 40 * np.cos(i / 5), 200 + rng.normal(0, 3), extended=pose, label="Right"),
+        ])
+        yield labels, pts
+
+
+# ------------------------------------------------------------
+# Stages
+# ------------------------------------------------------------
+def bench_detect(n):
+    gestures.warm_up()
+    frame = synthetic_frame()
+    return measure(lambda: gestures.detect(frame.copy()), n, warmup=3)
+
+
+def bench_classify(n):
+    frames = list(landmark_stream(n + 10))
+    it = iter(frames * 2)
+
+    def step():
+        labels, pts = next(it)
+        gestures.classify_frame(labels, pts)
+    return measure(step, n)
+
+
+def sample_results():
+    return [
+        {"hand": "Left", "gesture": "OPEN_PALM", "fingers": 5, "volume": 62, "ts": time.time()},
+        {"hand": "Right", "gesture": "PEACE", "fingers": 2, "volume": 35, "ts": time.time()},
+    ]
+
+
+def bench_overlay(n):
+    frame = synthetic_frame()
+    results = sample_results()
+    return measure(lambda: run_time.draw_overlay(frame.copy(), results), n)
+
+
+def bench_jpeg(n):
+    frame = run_time.draw_overlay(synthetic_frame(), sample_results())
+    return measure(lambda: cv2.imencode(".jpg", frame), n)
+
+
+async def _bench_broadcast(n_clients, n_msgs):
+    """Time from broadcast() until every client has received the message."""
+    received = 0
+    all_in = asyncio.Event()
+
+    async def client(port):
+        nonlocal received
+        async with websockets.connect(f"ws://127.0.0.1:{port}") as ws:
+            ready.append(ws)
+            async for raw in ws:
+                if isinstance(raw, str) and '"connected"' in raw:
+                    continue
+                received += 1
+                if received == n_clients:
+                    all_in.set()
+
+    ready = []
+    async with websockets.serve(run_time.ws_handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        tasks = [asyncio.create_task(client(port)) for _ in range(n_clients)]
+        while len(run_time.CLIENTS) < n_clients:
+            await asyncio.sleep(0.01)
+
+        msg = run_time.gesture_message(sample_results()[0])
+        samples = []
+        for i in range(n_msgs + 5):
+            received = 0
+            all_in.clear()
+            t0 = time.perf_counter_ns()
+            await run_time.broadcast(msg)
+            await asyncio.wait_for(all_in.wait(), timeout=5)
+            if i >= 5:
+                samples.append(time.perf_counter_ns() - t0)
+
+        for ws in ready:
+            await ws.close()
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return summarize(samples)
+
+
+def bench_broadcast(n_clients, n):
+    return asyncio.run(_bench_broadcast(n_clients, n))
+
+
+def null_bridge(async_out=True):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Bridge(port=NullPort(), async_out=async_out, max_rate=0)
+
+
+def bench_bridge_send(n, async_out=True):
+    bridge = null_bridge(async_out)
+    try:
+        return measure(lambda: bridge.send("PLAY_A", 1.0), n)
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            bridge.close()
+
+
+def bench_bridge_cc(n, async_out=True):
+    bridge = null_bridge(async_out)
+    vals = iter(np.tile(np.linspace(0, 1, 128), n // 128 + 2))
+    try:
+        return measure(lambda: bridge.send_cc_named("VOL_A", next(vals)), n)
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            bridge.close()
+
+
+# ------------------------------------------------------------
+# Entry Point
+# ------------------------------------------------------------
+def run(quick=False, only=None):
+    n = 200 if quick else 2000
+    stages = {
+        "detect": lambda: bench_detect(20 if quick else 200),
+        "classify_hand_state": lambda: bench_classify(n),
+        "overlay": lambda: bench_overlay(n // 4),
+        "jpeg_encode": lambda: bench_jpeg(n // 4),
+        "broadcast_1": lambda: bench_broadcast(1, n // 4),
+        "broadcast_10": lambda: bench_broadcast(10, n // 4),
+        "broadcast_100": lambda: bench_broadcast(100, n // 10),
+        "bridge_send": lambda: bench_bridge_send(n),
+        "bridge_send_cc_named": lambda: bench_bridge_cc(n),
+        "bridge_send_sync": lambda: bench_bridge_send(n, async_out=False),
+        "bridge_send_cc_named_sync": lambda: bench_bridge_cc(n, async_out=False),
+    }
+    gestures.set_sink(NullSink())
+    report = {}
+    for name, fn in stages.items():
+        if only and name not in only:
+            continue
+        try:
+            report[name] = fn()
+        except Exception as e:
+            report[name] = {"error": f"{type(e).__name__}: {e}"}
+        r = report[name]
+        if "error" in r:
+            print(f"{name:<22} ERROR {r['error']}", file=sys.stderr)
+        else:
+            print(f"{name:<22} {r['ops_per_sec']:>10.1f} ops/s  p50 {r['p50_us']:>9.1f}us  "
+                  f"p99 {r['p99_us']:>9.1f}us", file=sys.stderr)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Shaka gesture pipeline")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations")
+    parser.add_argument("--only", nargs="*", help="stage names to run")
+    parser.add_argument("--out", help="write JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {"ts": time.time(), "python": sys.version.split()[0],
+                 "numpy": np.__version__, "opencv": cv2.__version__},
+        "stages": run(quick=args.quick, only=args.only),
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
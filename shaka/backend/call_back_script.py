@@ -1,10 +1,14 @@
 #used for connecting web sockets call backs in the touch designer app
+hands = {}      # last known state per hand (delta stream)
+last_seq = 0
+
 def onConnect(websocketDAT, connection):
     debug(' Connected to Python backend')
     return
 
 def onReceiveText(websocketDAT, connection, data):
     import json
+    global last_seq
     try:
         msg = json.loads(data)
     except Exception as e:
@@ -14,13 +18,34 @@ def onReceiveText(websocketDAT, connection, data):
     msg_type = msg.get("type")
 
     if msg_type == "gesture":
-        op('text1').text = f"Gesture: {msg['name']} ({msg['conf']:.2f})"
+        op('text1').text = f"Gesture: {msg['hand']} {msg['gesture']} (vol {msg['volume']})"
+    elif msg_type == "snapshot":
+        hands.clear()
+        hands.update(msg["hands"])
+        last_seq = msg["seq"]
+        show_hands()
+    elif msg_type == "frame":
+        if msg["seq"] <= last_seq:
+            return  # already contained in the snapshot
+        if msg["seq"] != last_seq + 1:
+            debug(f" Missed {msg['seq'] - last_seq - 1} frame(s)")
+        last_seq = msg["seq"]
+        for hand, changes in msg["hands"].items():
+            if changes is None:
+                hands.pop(hand, None)
+            else:
+                hands.setdefault(hand, {}).update(changes)
+        show_hands()
     elif msg_type == "action":
         op('text1').text = f"Action: {msg['name']}"
     elif msg_type == "state":
         op('text1').text = f"State: {msg}"
     return
 
+def show_hands():
+    lines = [f"{h}: {s.get('gesture')} (vol {s.get('volume')})" for h, s in sorted(hands.items())]
+    op('text1').text = "\n".join(lines) or "No hands"
+
 def onDisconnect(websocketDAT, connection):
     debug('Disconnected from backend')
     return
@@ -0,0 +1,111 @@
+# capture.py
+# ------------------------------------------------------------
+# Threaded camera capture with latest-frame handoff
+# ------------------------------------------------------------
+# cap.read() blocks until the driver hands over a frame, so it runs
+# on its own thread here. Only the newest frame is kept: if nobody
+# picked up the previous one it is dropped and counted.
+# ------------------------------------------------------------
+
+import threading
+import time
+import cv2
+
+
+class FrameGrabber:
+    """
+    Camera reader running on a dedicated thread.
+    - Single-slot buffer: a new frame replaces any frame not yet read.
+    - read(): newest unseen frame or (None, 0.0), never blocks
+    - wait(timeout): blocking variant for worker threads
+    - stats(): captured / dropped / failed frame counters
+    - resize(w, h): change the capture size (applied by the capture thread)
+    """
+    def __init__(self, source=0, width=None, height=None):
+        self.source = source
+        self.cap = cv2.VideoCapture(source)
+        if width:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        # ask the driver not to queue frames behind our back
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self._cond = threading.Condition()
+        self._frame = None
+        self._ts = 0.0
+        self._fresh = False
+        self._running = False
+        self._thread = None
+        self._resize = None
+
+        self.captured = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def start(self):
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="capture", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        failing = False
+        while self._running:
+            if self._resize is not None:
+                (w, h), self._resize = self._resize, None
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, w)
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
+            ok, frame = self.cap.read()
+            if not ok or frame is None:
+                self.failed += 1
+                if not failing:
+                    print("⚠️ Camera frame skipped")
+                    failing = True
+                time.sleep(0.05)
+                continue
+            failing = False
+            ts = time.time()
+            with self._cond:
+                if self._fresh:
+                    self.dropped += 1
+                self._frame = frame
+                self._ts = ts
+                self._fresh = True
+                self.captured += 1
+                self._cond.notify_all()
+
+    def read(self):
+        """Return (frame, capture_ts) for the newest unseen frame, or (None, 0.0)."""
+        with self._cond:
+            if not self._fresh:
+                return None, 0.0
+            self._fresh = False
+            return self._frame, self._ts
+
+    def wait(self, timeout=1.0):
+        """Block until a new frame arrives (or timeout) and return it like read()."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._fresh or not self._running, timeout):
+                return None, 0.0
+            if not self._fresh:
+                return None, 0.0
+            self._fresh = False
+            return self._frame, self._ts
+
+    def resize(self, width, height):
+        """Ask for a new capture size; the driver may pick the nearest it supports."""
+        self._resize = (width, height)
+
+    def stats(self):
+        return {"captured": self.captured, "dropped": self.dropped, "failed": self.failed}
+
+    def stop(self):
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        self.cap.release()
@@ -0,0 +1,212 @@
+# clients.py
+# ------------------------------------------------------------
+# Per-client WebSocket send queues + wire formats
+# ------------------------------------------------------------
+# broadcast() never waits on a socket: every client has its own small
+# outgoing queue drained by a writer task, so one stalled TouchDesigner
+# or browser tab cannot slow the camera pipeline down.
+#
+# Queue policies when a client falls behind:
+#   drop_oldest  drop the oldest pending message
+#   coalesce     messages with the same key (e.g. gesture per hand)
+#                replace the pending one (last value wins)
+#
+# Formats (negotiated with ?format=... or {"type": "hello", "format": ...}):
+#   json     text frames (default)
+#   msgpack  binary frames, if the msgpack package is installed
+#   struct   binary "gesture" frames: <BBBBd (kind, hand, fingers, volume, ts)
+#            followed by the UTF-8 gesture name; other messages stay JSON
+# ------------------------------------------------------------
+
+import asyncio
+import json
+import struct
+import time
+from collections import OrderedDict
+from itertools import count
+from urllib.parse import parse_qs, urlparse
+
+from metrics import METRICS
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+FORMATS = ("json", "msgpack", "struct") if msgpack else ("json", "struct")
+POLICIES = ("drop_oldest", "coalesce")
+
+STRUCT_GESTURE = struct.Struct("<BBBBd")
+KIND_GESTURE = 1
+HAND_CODES = {"Left": 0, "Right": 1}
+
+
+def encode(msg: dict, fmt: str = "json"):
+    """Encode one message for a wire format (str for text frames, bytes for binary)."""
+    if fmt == "struct" and msg.get("type") == "gesture":
+        head = STRUCT_GESTURE.pack(
+            KIND_GESTURE,
+            HAND_CODES.get(msg.get("hand"), 255),
+            int(msg.get("fingers", 0)) & 0xFF,
+            max(0, min(255, int(msg.get("volume", 0)))),
+            float(msg.get("ts", 0.0)),
+        )
+        return head + str(msg.get("gesture", "")).encode()
+    if fmt == "msgpack" and msgpack is not None:
+        return msgpack.packb(msg, use_single_float=True)
+    return json.dumps(msg)
+
+
+def decode_struct(data: bytes) -> dict:
+    """Inverse of the struct gesture encoding (for clients and tests)."""
+    kind, hand, fingers, volume, ts = STRUCT_GESTURE.unpack_from(data)
+    names = {v: k for k, v in HAND_CODES.items()}
+    return {
+        "type": "gesture" if kind == KIND_GESTURE else kind,
+        "hand": names.get(hand, "Unknown"),
+        "gesture": data[STRUCT_GESTURE.size:].decode(),
+        "fingers": fingers,
+        "volume": volume,
+        "ts": ts,
+    }
+
+
+def coalesce_key(msg: dict):
+    """Messages sharing a key may replace each other in a client's queue."""
+    if msg.get("type") == "gesture":
+        return "gesture", msg.get("hand")
+    return None
+
+
+def requested_format(ws, default="json"):
+    """Read ?format= from the connection URL (websockets old + new APIs)."""
+    request = getattr(ws, "request", None)
+    path = getattr(request, "path", None) or getattr(ws, "path", "") or ""
+    fmt = parse_qs(urlparse(path).query).get("format", [default])[0]
+    return fmt if fmt in FORMATS else default
+
+
+class ClientChannel:
+    """
+    One connected client: bounded outgoing queue + writer task.
+    - push(data, key, t_capture): enqueue pre-encoded data, never blocks
+    - handle(raw): process a client -> server message (format / policy hello)
+    - snapshot_fn: for delta streams; on overflow the queue is replaced by a
+      fresh snapshot instead of silently losing deltas
+    """
+    _ids = count(1)
+
+    def __init__(self, ws, fmt="json", policy="drop_oldest", maxsize=32, snapshot_fn=None):
+        self.ws = ws
+        self.snapshot_fn = snapshot_fn
+        self.id = next(self._ids)
+        self.fmt = fmt if fmt in FORMATS else "json"
+        self.policy = policy if policy in POLICIES else "drop_oldest"
+        self.maxsize = maxsize
+
+        self._queue = OrderedDict()   # key -> (data, t_capture)
+        self._seq = count()
+        self._wake = asyncio.Event()
+        self._task = None
+
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.resyncs = 0
+        self.connected_at = time.time()
+
+    def start(self):
+        self._task = asyncio.create_task(self._writer())
+        return self
+
+    def push(self, data, key=None, t_capture=None):
+        if key is None or self.policy != "coalesce":
+            key = ("seq", next(self._seq))
+        elif key in self._queue:
+            self._queue[key] = (data, t_capture)   # keep its place, last value wins
+            self.coalesced += 1
+            return
+        if len(self._queue) >= self.maxsize:
+            METRICS.incr("ws_dropped")
+            if self.snapshot_fn is not None:
+                # the snapshot already contains this message's state
+                self.dropped += len(self._queue)
+                self._queue.clear()
+                self._queue[key] = (encode(self.snapshot_fn(), self.fmt), t_capture)
+                self.resyncs += 1
+                return
+            self._queue.popitem(last=False)
+            self.dropped += 1
+        self._queue[key] = (data, t_capture)
+        self._wake.set()
+
+    @property
+    def lagging(self):
+        return len(self._queue) > self.maxsize // 2
+
+    async def _writer(self):
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            while self._queue:
+                _, (data, t_capture) = self._queue.popitem(last=False)
+                try:
+                    await self.ws.send(data)
+                except Exception:
+                    return   # connection gone; ws_handler cleans up
+                self.sent += 1
+                METRICS.since("capture_to_ws", t_capture)
+
+    def handle(self, raw):
+        """Client hello: {"type": "hello", "format": "struct", "policy": "coalesce"}."""
+        if not isinstance(raw, str):
+            return False
+        try:
+            msg = json.loads(raw)
+        except ValueError:
+            return False
+        if not isinstance(msg, dict) or msg.get("type") != "hello":
+            return False
+        if msg.get("format") in FORMATS:
+            self.fmt = msg["format"]
+        if msg.get("policy") in POLICIES:
+            self.policy = msg["policy"]
+        return True
+
+    def stats(self):
+        return {
+            "id": self.id,
+            "format": self.fmt,
+            "policy": self.policy,
+            "queued": len(self._queue),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "resyncs": self.resyncs,
+            "lagging": self.lagging,
+        }
+
+    def close(self):
+        if self._task:
+            self._task.cancel()
+
+
+def fan_out(clients, msg: dict, t_capture=None):
+    """Encode once per wire format in use and queue on every client."""
+    key = coalesce_key(msg)
+    encoded = {}
+    for ch in list(clients):
+        data = encoded.get(ch.fmt)
+        if data is None:
+            data = encoded[ch.fmt] = encode(msg, ch.fmt)
+        ch.push(data, key, t_capture)
+
+
+def clients_stats(clients):
+    chans = [c.stats() for c in list(clients)]
+    return {
+        "connected": len(chans),
+        "lagging": sum(c["lagging"] for c in chans),
+        "dropped": sum(c["dropped"] for c in chans),
+        "clients": chans,
+    }
@@ -0,0 +1,290 @@
+# engines.py
+# ------------------------------------------------------------
+# Multi-performer runs: one GestureEngine per camera / stream,
+# each in its own worker process
+# ------------------------------------------------------------
+# A worker owns a FrameGrabber and a gestures.GestureEngine and sends
+# everything back over one multiprocessing queue:
+#   ("ready",   session, source)
+#   ("results", session, results, t_capture[, seq])
+#   ("midi",    session, raw message bytes)
+# The parent merges them into the shared WebSocket / MIDI outputs.
+# MIDI channels are assigned per session: session i plays its Left
+# hand on channel 2*i and its Right hand on 2*i + 1.
+#
+# RingDetector is the single-camera variant: capture stays in the
+# parent and writes into a framering.FrameRing; the worker runs detect
+# on the shared slot in place, so frames never cross a pipe.
+#
+# Run with: SHAKA_SOURCES=0,1 python run_time.py   (one engine per camera)
+#           SHAKA_SHM=1 python run_time.py         (capture | detect process)
+# ------------------------------------------------------------
+
+import multiprocessing as mp
+import queue
+import time
+from sinks import MidiSink
+
+
+MAX_SOURCES = 8   # two MIDI channels per session (Left, Right), 16 channels in all
+
+
+def parse_sources(spec):
+    """"0,1,rtsp://cam" -> [0, 1, "rtsp://cam"] (digits are camera indices)."""
+    return [int(s) if s.strip().isdigit() else s.strip()
+            for s in (spec or "").split(",") if s.strip()]
+
+
+class QueueSink(MidiSink):
+    """Worker-side sink: MIDI goes to the parent as raw bytes."""
+    def __init__(self, out_q, session):
+        self.out_q = out_q
+        self.session = session
+
+    def send(self, msg, t_capture=None):
+        self.out_q.put(("midi", self.session, bytes(msg.bytes()), t_capture))
+
+
+def make_keyframes(max_interval):
+    if max_interval > 1:
+        from keyframe import KeyframeTracker
+        return KeyframeTracker(max_interval=max_interval)
+    return None
+
+
+def make_idle(after):
+    if after > 0:
+        from idle import IdleGate
+        return IdleGate(after=after)
+    return None
+
+
+def make_templates(templates):
+    """templates: (path, notes) of a templates.py .npz, or None."""
+    if templates:
+        from templates import TemplateIndex
+        path, notes = templates
+        return TemplateIndex.load(path), notes
+    return None, None
+
+
+def engine_worker(session, source, out_q, stop, width=1080, height=420,
+                  target_fps=30, hands_options=None, keyframes=1, idle_after=0, templates=None):
+    """Worker process body: capture -> detect -> results queue, until stop is set."""
+    import cv2
+    from capture import FrameGrabber
+    from gestures import GestureEngine
+    from pacing import FramePacer
+
+    index, notes = make_templates(templates)
+    engine = GestureEngine(session=session, channel=2 * session,
+                           sink=QueueSink(out_q, session), hands_options=hands_options,
+                           keyframes=make_keyframes(keyframes), idle=make_idle(idle_after),
+                           templates=index, notes=notes)
+    engine.warm_up(width, height)
+    grabber = FrameGrabber(source, width=width, height=height).start()
+    pacer = FramePacer(target_fps)
+    out_q.put(("ready", session, str(source)))
+    try:
+        while not stop.is_set():
+            frame, t_capture = grabber.wait(0.5)
+            if frame is None:
+                continue
+            pacer.begin()
+            frame = cv2.flip(frame, 1)
+            try:
+                results = engine.detect(frame, t_capture=t_capture, draw=False)
+            except Exception as e:
+                print(f"⚠️ [session {session}] Detect error: {e}")
+                results = []
+            out_q.put(("results", session, results, t_capture))
+            pacer.wait_sync()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        grabber.stop()
+        engine.close()
+
+
+class EnginePool:
+    """
+    Runs one engine_worker process per source.
+    - start(): spawn the workers
+    - poll(timeout): next (session, results, t_capture, ...), or None on timeout;
+      MIDI from any worker is forwarded to `sink` as it arrives
+    - stats(): per-session frames / MIDI counts / liveness
+    - stop(): ask workers to finish, then terminate stragglers
+    At most MAX_SOURCES: session n sends on MIDI channels 2n and 2n + 1.
+    """
+    def __init__(self, sources, sink, width=1080, height=420, target_fps=30,
+                 hands_options=None, keyframes=1, idle_after=0, templates=None):
+        if len(sources) > MAX_SOURCES:
+            raise ValueError(f"{len(sources)} sources but at most {MAX_SOURCES} fit in 16 MIDI channels")
+        self.sources = list(sources)
+        self.sink = sink
+        self.width = width
+        self.height = height
+        self.target_fps = target_fps
+        self.hands_options = hands_options
+        self.keyframes = keyframes   # max model interval per engine (1 = every frame)
+        self.idle_after = idle_after # empty frames before an engine goes idle (0 = never)
+        self.templates = templates   # (path, notes) of pose templates, loaded by each engine
+
+        # spawn: workers must not inherit the parent's threads / open camera
+        self._ctx = mp.get_context("spawn")
+        self.out_q = self._ctx.Queue()
+        self._stop = self._ctx.Event()
+        self.procs = []
+        self.running = False
+
+        self.frames = [0] * len(self.sources)
+        self.midi = [0] * len(self.sources)
+        self.ready = [False] * len(self.sources)
+
+    def start(self):
+        for session, source in enumerate(self.sources):
+            p = self._ctx.Process(
+                target=engine_worker, name=f"engine-{session}", daemon=True,
+                args=(session, source, self.out_q, self._stop, self.width, self.height,
+                      self.target_fps, self.hands_options, self.keyframes, self.idle_after,
+                      self.templates))
+            p.start()
+            self.procs.append(p)
+        self.running = True
+        return self
+
+    def poll(self, timeout=0.5):
+        from mido import Message
+
+        deadline = time.monotonic() + timeout
+        while self.running:
+            try:
+                item = self.out_q.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                return None
+            kind, session = item[0], item[1]
+            if kind == "results":
+                self.frames[session] += 1
+                return item[1:]
+            if kind == "midi":
+                self.midi[session] += 1
+                self.sink.send(Message.from_bytes(item[2]), item[3])
+            elif kind == "ready":
+                self.ready[session] = True
+                print(f"🎥 Engine {session} ready on source {item[2]}")
+        return None
+
+    def stats(self):
+        return {
+            str(session): {
+                "source": str(source),
+                "alive": session < len(self.procs) and self.procs[session].is_alive(),
+                "ready": self.ready[session],
+                "frames": self.frames[session],
+                "midi": self.midi[session],
+            }
+            for session, source in enumerate(self.sources)
+        }
+
+    def stop(self, timeout=2.0):
+        self.running = False
+        self._stop.set()
+        for p in self.procs:
+            p.join(timeout)
+            if p.is_alive():
+                p.terminate()
+        self.procs = []
+
+
+def ring_worker(session, ring_spec, wake_q, out_q, stop, draw, hands_options=None, keyframes=1,
+                idle_after=0, templates=None):
+    """
+    Worker process body for RingDetector: on each wake-up, detect on the newest
+    ring slot in place. Results for a frame that got overwritten mid-detect are
+    dropped (and counted in the ring's torn counter).
+    """
+    from framering import FrameRing
+    from gestures import GestureEngine
+
+    ring = FrameRing.attach(*ring_spec)
+    # untagged results: this is the single-camera run, just in another process
+    index, notes = make_templates(templates)
+    engine = GestureEngine(channel=2 * session,
+                           sink=QueueSink(out_q, session), hands_options=hands_options,
+                           keyframes=make_keyframes(keyframes), idle=make_idle(idle_after),
+                           templates=index, notes=notes)
+    h, w, _ = ring.shape
+    engine.warm_up(w, h)
+    out_q.put(("ready", session, ring_spec[0]))
+    last = 0
+    try:
+        while not stop.is_set():
+            try:
+                wake_q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            seq = ring.head
+            if seq == last:
+                continue
+            last = seq
+            frame = ring.view(seq)
+            if frame is None:
+                continue
+            t_capture = ring.ts(seq)
+            try:
+                results = engine.detect(frame, t_capture=t_capture, draw=bool(draw.value))
+            except Exception as e:
+                print(f"⚠️ Detect error: {e}")
+                results = []
+            if not ring.valid(seq):
+                ring.mark_torn()
+                continue
+            out_q.put(("results", session, results, t_capture, seq))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.close()
+        ring.close()
+
+
+class RingDetector(EnginePool):
+    """
+    One detect worker reading frames from a shared framering.FrameRing.
+    - submit(): tell the worker a new frame is in the ring (never blocks;
+      the worker always takes the newest slot, so wake-ups may be dropped)
+    - poll(timeout): next (session, results, t_capture, seq)
+    - draw: the worker draws landmarks into the slot only while this is set
+    """
+    def __init__(self, ring, sink, hands_options=None, keyframes=1, idle_after=0, templates=None):
+        super().__init__([ring.spec()[0]], sink, hands_options=hands_options, keyframes=keyframes,
+                         idle_after=idle_after, templates=templates)
+        self.ring = ring
+        self._wake = self._ctx.Queue(maxsize=2)
+        self._draw = self._ctx.Value("b", 1, lock=False)
+
+    @property
+    def draw(self):
+        return bool(self._draw.value)
+
+    @draw.setter
+    def draw(self, on):
+        self._draw.value = 1 if on else 0
+
+    def start(self):
+        p = self._ctx.Process(
+            target=ring_worker, name="detect", daemon=True,
+            args=(0, self.ring.spec(), self._wake, self.out_q, self._stop, self._draw,
+                  self.hands_options, self.keyframes, self.idle_after, self.templates))
+        p.start()
+        self.procs.append(p)
+        self.running = True
+        return self
+
+    def submit(self):
+        try:
+            self._wake.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def stats(self):
+        return {**super().stats()["0"], **self.ring.stats()}
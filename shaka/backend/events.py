@@ -0,0 +1,68 @@
+# events.py
+# ------------------------------------------------------------
+# Coalesced, delta-only gesture event stream
+# ------------------------------------------------------------
+# One message per frame for both hands, carrying only the fields that
+# changed since the previous message:
+#   {"type": "frame", "seq": 42, "ts": ..., "hands": {"Left": {"volume": 61}, "Right": null}}
+# A hand mapped to null has left the frame. Frames where nothing changed
+# send nothing. New clients first get a full state snapshot:
+#   {"type": "snapshot", "seq": 42, "ts": ..., "hands": {"Left": {...}}}
+# Clients apply frames with seq > snapshot seq; a gap in seq means a
+# message was lost and the next snapshot should be awaited.
+# With several engines (engines.py) each session updates its own scope
+# and its hands are keyed "<session>:<hand>", e.g. "1:Left".
+# ------------------------------------------------------------
+
+import time
+
+FIELDS = ("gesture", "fingers", "volume")
+
+
+class GestureStream:
+    """
+    - update(results, ts, scope): delta "frame" message, or None when nothing changed;
+      only hands of the same scope count as departed when missing from results
+    - snapshot(): full current state as a "snapshot" message
+    """
+    def __init__(self, fields=FIELDS):
+        self.fields = fields
+        self.seq = 0
+        self.ts = 0.0
+        self.hands = {}   # hand -> {field: value}
+        self.scopes = {}  # hand -> scope that reported it
+
+    def update(self, results, ts=None, scope=None):
+        ts = ts if ts is not None else time.time()
+        changes = {}
+        present = set()
+        for r in results:
+            hand = r.get("hand", "Unknown")
+            if scope is not None:
+                hand = f"{scope}:{hand}"
+            present.add(hand)
+            self.scopes[hand] = scope
+            cur = {f: r.get(f) for f in self.fields}
+            prev = self.hands.get(hand)
+            diff = cur if prev is None else {k: v for k, v in cur.items() if prev.get(k) != v}
+            if diff:
+                changes[hand] = diff
+            self.hands[hand] = cur
+        for hand in [h for h in self.hands if h not in present and self.scopes.get(h) == scope]:
+            del self.hands[hand]
+            del self.scopes[hand]
+            changes[hand] = None
+
+        if not changes:
+            return None
+        self.seq += 1
+        self.ts = ts
+        return {"type": "frame", "seq": self.seq, "ts": ts, "hands": changes}
+
+    def snapshot(self):
+        return {
+            "type": "snapshot",
+            "seq": self.seq,
+            "ts": self.ts,
+            "hands": {h: dict(v) for h, v in self.hands.items()},
+        }
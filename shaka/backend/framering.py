@@ -0,0 +1,114 @@
+# framering.py
+# ------------------------------------------------------------
+# Shared-memory frame ring (zero-copy frames between processes)
+# ------------------------------------------------------------
+# One multiprocessing.shared_memory block holds a small header and
+# `slots` preallocated frames:
+#   header   int64 [head seq, torn count, seq of each slot]
+#            float64 [capture ts of each slot]
+#   frames   uint8 (slots, h, w, 3)
+# Frame number `seq` lives in slot seq % slots. The single writer marks
+# a slot -1 while filling it and stamps the new seq when done, so a
+# reader can check afterwards whether the frame it used was overwritten
+# (valid(seq)) instead of locking. Nothing is pickled: other processes
+# attach by name via FrameRing.attach(*ring.spec()).
+# ------------------------------------------------------------
+
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+
+HEADER_ALIGN = 64
+
+
+class FrameRing:
+    """
+    Ring of preallocated frame slots in shared memory.
+    - write(frame, ts, flip): copy (optionally mirrored) into the next slot -> seq
+    - begin() / commit(seq, ts): fill ring.slot(seq) in place instead
+    - head: newest committed seq (0 = nothing written yet)
+    - view(seq): the slot as an ndarray (no copy), or None if already overwritten
+    - valid(seq): frame seq is still intact
+    """
+    def __init__(self, shape, slots=8, name=None, create=True):
+        self.shape = tuple(shape)
+        self.slots = slots
+        n_meta = 2 + slots
+        head_bytes = -(-(n_meta * 8 + slots * 8) // HEADER_ALIGN) * HEADER_ALIGN
+        frame_bytes = int(np.prod(self.shape))
+        size = head_bytes + slots * frame_bytes
+        self.owner = create
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        buf = self.shm.buf
+        self._meta = np.ndarray((n_meta,), dtype=np.int64, buffer=buf)
+        self._ts = np.ndarray((slots,), dtype=np.float64, buffer=buf, offset=n_meta * 8)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=buf,
+                                 offset=head_bytes)
+        if create:
+            self._meta[:] = 0
+
+    @classmethod
+    def attach(cls, name, shape, slots):
+        return cls(shape, slots=slots, name=name, create=False)
+
+    def spec(self):
+        """(name, shape, slots): everything another process needs to attach."""
+        return self.shm.name, self.shape, self.slots
+
+    @property
+    def head(self):
+        return int(self._meta[0])
+
+    @property
+    def torn(self):
+        return int(self._meta[1])
+
+    def mark_torn(self):
+        self._meta[1] += 1
+
+    # -------- writer side (one process) --------
+    def begin(self):
+        """Claim the next slot for writing; returns its seq (fill self.slot(seq), then commit)."""
+        seq = self.head + 1
+        self._meta[2 + seq % self.slots] = -1
+        return seq
+
+    def commit(self, seq, ts):
+        i = seq % self.slots
+        self._ts[i] = ts
+        self._meta[2 + i] = seq
+        self._meta[0] = seq
+
+    def slot(self, seq):
+        return self.frames[seq % self.slots]
+
+    def write(self, frame, ts, flip=False):
+        """One copy from the capture buffer into shared memory (mirrored on the way if flip)."""
+        seq = self.begin()
+        dst = self.slot(seq)
+        if flip:
+            cv2.flip(frame, 1, dst=dst)
+        else:
+            np.copyto(dst, frame)
+        self.commit(seq, ts)
+        return seq
+
+    # -------- reader side (any process) --------
+    def valid(self, seq):
+        return seq > 0 and int(self._meta[2 + seq % self.slots]) == seq
+
+    def ts(self, seq):
+        return float(self._ts[seq % self.slots])
+
+    def view(self, seq):
+        return self.slot(seq) if self.valid(seq) else None
+
+    def stats(self):
+        return {"head": self.head, "slots": self.slots, "torn": self.torn}
+
+    def close(self):
+        # drop our views before the mapping goes away
+        self._meta = self._ts = self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
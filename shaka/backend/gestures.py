@@ -1,159 +1,550 @@
 import cv2
 import time
 import numpy as np
-import mediapipe as mp
-from collections import deque
-import mido
 from mido import Message
+from metrics import METRICS
+from sinks import PortSink
 
 # ------------------------------------------------------------
-# MIDI setup
+# Mediapipe setup (lazy: imported on first detect() or warm_up())
 # ------------------------------------------------------------
-try:
-    outport = mido.open_output('shaka 1')
-except IOError:
-    outport = mido.open_output('shaka')
+HANDS_OPTIONS = dict(max_num_hands=2, min_detection_confidence=0.7, min_tracking_confidence=0.7)
 
-def send_midi_note(hand, note, velocity=100):
-    msg = Message('note_on', note=note, velocity=velocity, channel=0 if hand == "Left" else 1)
-    outport.send(msg)
+mp_hands = None
+mp_draw = None
 
-def send_midi_cc(hand, control, value):
-    msg = Message('control_change', control=control, value=int(value),
-                  channel=0 if hand == "Left" else 1)
-    outport.send(msg)
+def load_mediapipe():
+    """Import MediaPipe's hands solution once per process."""
+    global mp_hands, mp_draw
+    if mp_hands is None:
+        import mediapipe as mp
+        mp_hands = mp.solutions.hands
+        mp_draw = mp.solutions.drawing_utils
+    return mp_hands
 
 # ------------------------------------------------------------
-# Mediapipe setup
+# Wrist motion history (timestamped ring buffer)
 # ------------------------------------------------------------
-mp_hands = mp.solutions.hands
-mp_draw = mp.solutions.drawing_utils
-hands = mp_hands.Hands(max_num_hands=2, min_detection_confidence=0.7, min_tracking_confidence=0.7)
+MOTION_WINDOW = 0.2   # seconds of wrist travel used for velocity (was 5 frames @ 20 FPS)
+REF_FRAME_DT = 0.05   # frame spacing the volume gain/smoothing were tuned at
+REF_WIDTH = 1080      # motion thresholds are pixels of a frame this wide, whatever the capture size
+
+
+class MotionHistory:
+    """
+    Preallocated ring of timestamped wrist positions.
+    - append(t, pos)
+    - window(span): (elapsed, delta_xyz, frame_dt) between the newest sample and the
+      oldest one no older than ~span, or None while history is too short
+    """
+    def __init__(self, capacity=64):
+        self.t = np.zeros(capacity)
+        self.pos = np.zeros((capacity, 3))
+        self.capacity = capacity
+        self.head = -1
+        self.count = 0
+
+    def append(self, t, pos):
+        self.head = (self.head + 1) % self.capacity
+        self.t[self.head] = t
+        self.pos[self.head] = pos[:3]
+        self.count = min(self.count + 1, self.capacity)
+
+    def clear(self):
+        self.head = -1
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def window(self, span):
+        if self.count < 2:
+            return None
+        newest = self.head
+        t_new = self.t[newest]
+        # walk back while samples stay inside span (+10% for frame jitter)
+        oldest = newest
+        for k in range(1, self.count):
+            i = (newest - k) % self.capacity
+            if t_new - self.t[i] > span * 1.1:
+                break
+            oldest = i
+        elapsed = t_new - self.t[oldest]
+        if elapsed < span * 0.75:
+            return None
+        frame_dt = t_new - self.t[(newest - 1) % self.capacity]
+        return elapsed, self.pos[newest] - self.pos[oldest], frame_dt
 
-left_hist = deque(maxlen=5)
-right_hist = deque(maxlen=5)
 
-mirror_flip = True  # flip directions if your webcam mirrors the image
-
-state = {
-    "Left": {"volume": 50, "prev_volume": 50, "last_swipe": {"text": "", "time": 0, "dir": None}},
-    "Right": {"volume": 50, "prev_volume": 50, "last_swipe": {"text": "", "time": 0, "dir": None}},
-}
+# ------------------------------------------------------------
+# Pose latch: static gestures fire MIDI on transitions only
+# ------------------------------------------------------------
+NOTE_MAP = {"FIST": 60, "OPEN_PALM": 62, "SHAKA": 66}
+CC_MAP = {"PEACE": (91, 127, 0)}   # control, value on enter, value on release
+
+HOLD_FRAMES = 3        # frames a new pose must persist before it fires
+RELEASE_FRAMES = 3     # frames without a mapped pose before it is released
+MIN_CONFIDENCE = 0.75  # handedness score below this doesn't move the latch
+
+
+class GestureLatch:
+    """
+    Debounced per-hand pose state.
+    update(pose, confidence) -> (released, entered) on a transition, else None.
+    Only poses in `notes` (default NOTE_MAP) / CC_MAP are latched; anything else
+    counts as "no pose".
+    """
+    def __init__(self, hold_frames=HOLD_FRAMES, release_frames=RELEASE_FRAMES,
+                 min_confidence=MIN_CONFIDENCE, notes=None):
+        self.notes = NOTE_MAP if notes is None else notes
+        self.hold_frames = hold_frames
+        self.release_frames = release_frames
+        self.min_confidence = min_confidence
+        self.active = None
+        self._candidate = None
+        self._count = 0
+
+    def update(self, pose, confidence=1.0):
+        if pose not in self.notes and pose not in CC_MAP:
+            pose = None
+        if confidence < self.min_confidence:
+            return None
+        if pose == self.active:
+            self._candidate, self._count = None, 0
+            return None
+        if pose == self._candidate:
+            self._count += 1
+        else:
+            self._candidate, self._count = pose, 1
+        need = self.hold_frames if pose is not None else self.release_frames
+        if self._count < need:
+            return None
+        released, self.active = self.active, pose
+        self._candidate, self._count = None, 0
+        return released, pose
+
+
+def new_hand_state():
+    return {"volume": 50, "prev_volume": 50, "last_swipe": {"text": "", "time": 0, "dir": None}}
 
 # ------------------------------------------------------------
 # Helper functions
 # ------------------------------------------------------------
-def get_finger_states(pts, label):
-    states = {"thumb": 0, "index": 0, "middle": 0, "ring": 0, "pinky": 0}
-    if label == "Right":
-        states["thumb"] = int(pts[4][0] > pts[3][0])
-    else:
-        states["thumb"] = int(pts[4][0] < pts[3][0])
-    for name, tip, mid in zip(["index", "middle", "ring", "pinky"],
-                              [8, 12, 16, 20], [6, 10, 14, 18]):
-        states[name] = int(pts[tip][1] < pts[mid][1])
-    return states
-
-
-def classify_hand_state(label, pts):
-    wrist = pts[0]
-    fingers = get_finger_states(pts[:, :2], label)
-    up_count = sum(fingers.values())
-    gesture = "UNKNOWN"
+FINGERS = ["thumb", "index", "middle", "ring", "pinky"]
+TIP_IDX = np.array([8, 12, 16, 20])   # index..pinky tips
+MID_IDX = np.array([6, 10, 14, 18])   # index..pinky PIP joints
+FINGER_BITS = 1 << np.arange(5)       # thumb = bit 0 ... pinky = bit 4
+
 
+def _rule_gesture(fingers):
+    """The hand-written gesture rules for one finger-state dict."""
+    up_count = sum(fingers.values())
     if up_count == 0:
-        gesture = "FIST"
+        return "FIST"
     elif up_count == 5:
-        gesture = "OPEN_PALM"
+        return "OPEN_PALM"
     elif fingers["thumb"] and fingers["pinky"] and not any([fingers["index"], fingers["middle"], fingers["ring"]]):
-        gesture = "SHAKA"
+        return "SHAKA"
     elif fingers["index"] and fingers["middle"] and not any([fingers["thumb"], fingers["ring"], fingers["pinky"]]):
-        gesture = "PEACE"
+        return "PEACE"
     elif up_count == 1 and fingers["index"]:
-        gesture = "ONE_FINGER"
-    else:
-        gesture = f"{up_count}_FINGERS"
-
-    hist = left_hist if label == "Left" else right_hist
-    hist.append(wrist)
-
-    dx, dy, dz = 0, 0, 0
-    if len(hist) == hist.maxlen:
-        dx = hist[-1][0] - hist[0][0]
-        dy = hist[-1][1] - hist[0][1]
-        dz = hist[-1][2] - hist[0][2]
-        dt = 0.05 * (len(hist) - 1)
-        vx = dx / dt
-        vz = dz / dt
-
-        # --- Swipe detection (any hand shape, facing camera) ---
-        if abs(vx) > 400 and vz > -0.004:  # detect faster sideways motion
-            direction = "RIGHT" if vx > 0 else "LEFT"
-            if mirror_flip:
-                direction = "LEFT" if direction == "RIGHT" else "RIGHT"
-
-            now = time.time()
-            last = state[label]["last_swipe"]
-            if last["dir"] != direction or (now - last["time"] > 0.8):
-                gesture += f"_SWIPE_{direction}"
-                state[label]["last_swipe"] = {
-                    "text": f"{label} SWIPED {direction.upper()}!",
-                    "time": now,
-                    "dir": direction
-                }
-                send_midi_note(label, note=64 if direction == "RIGHT" else 65)
-
-        # --- Vertical movement (volume control) ---
-        elif abs(dy) > 30 and abs(dy) > abs(dx):
-            vol = state[label]["volume"]
-            vol += -dy * 0.1
-            prev_vol = state[label]["prev_volume"]
-            smoothed = 0.7 * prev_vol + 0.3 * vol
-            state[label]["prev_volume"] = smoothed
-            state[label]["volume"] = np.clip(smoothed, 0, 100)
-            send_midi_cc(label, 7, int(state[label]["volume"]))
-
-    # Static gestures
-    if gesture == "FIST":
-        send_midi_note(label, 60)
-    elif gesture == "OPEN_PALM":
-        send_midi_note(label, 62)
-    elif gesture == "SHAKA":
-        send_midi_note(label, 66)
-    elif gesture == "PEACE":
-        send_midi_cc(label, 91, 127)
-
-    return gesture, up_count, state[label]["volume"]
-
-
-def detect(frame):
-    """Detect hands, classify gestures, draw overlay, and return structured results."""
-    img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    result = hands.process(img_rgb)
-    if not result.multi_hand_landmarks:
-        return []
-
-    h, w, _ = frame.shape
-    outputs = []
-    for i, handLms in enumerate(result.multi_hand_landmarks):
-        label = result.multi_handedness[i].classification[0].label
-        pts = np.array([[lm.x * w, lm.y * h, lm.z] for lm in handLms.landmark])
-        gesture, count, volume = classify_hand_state(label, pts)
-        outputs.append({
-            "hand": label,
-            "gesture": gesture,
-            "fingers": count,
-            "volume": int(volume),
-            "ts": time.time()
-        })
-        mp_draw.draw_landmarks(frame, handLms, mp_hands.HAND_CONNECTIONS)
-    return outputs
+        return "ONE_FINGER"
+    return f"{up_count}_FINGERS"
+
+
+# every one of the 32 finger combinations, classified once up front
+GESTURE_TABLE = np.array([
+    _rule_gesture({name: (code >> bit) & 1 for bit, name in enumerate(FINGERS)})
+    for code in range(32)
+], dtype=object)
+
+
+def finger_masks(pts, labels):
+    """(hands, 21, >=2) landmarks + handedness labels -> (hands, 5) bool, thumb..pinky."""
+    pts = np.asarray(pts)
+    right = np.array([l == "Right" for l in labels], dtype=bool)
+    thumb = np.where(right, pts[:, 4, 0] > pts[:, 3, 0], pts[:, 4, 0] < pts[:, 3, 0])
+    others = pts[:, TIP_IDX, 1] < pts[:, MID_IDX, 1]
+    return np.column_stack([thumb, others])
+
+
+def classify_gestures(pts, labels):
+    """
+    Batched static classification for all hands in one pass.
+    Returns (gestures, up_counts, masks); same rules as _rule_gesture.
+    """
+    masks = finger_masks(pts, labels)
+    codes = masks.astype(np.int64) @ FINGER_BITS
+    return GESTURE_TABLE[codes], masks.sum(axis=1), masks
+
+
+def get_finger_states(pts, label):
+    mask = finger_masks(np.asarray(pts)[None], [label])[0]
+    return {name: int(v) for name, v in zip(FINGERS, mask)}
+
+
+# ------------------------------------------------------------
+# GestureEngine: all per-performer state in one object
+# ------------------------------------------------------------
+DEFAULT_PORTS = ("shaka 1", "shaka")
+
+
+class GestureEngine:
+    """
+    One camera / performer: hand model, wrist histories, volume state, pose
+    latches, optional ROI tracker + recorder, and the MIDI sink.
+    Engines share nothing, so several can run side by side (see engines.py).
+    - session: tag added to every result when several engines feed one output
+    - channel: MIDI channel of the Left hand; the Right hand uses channel + 1
+    - sink: sinks.MidiSink; defaults to the 'shaka 1' / 'shaka' port, opened on first message
+    """
+    def __init__(self, session=None, channel=0, sink=None, hands_options=None,
+                 tracker=None, recorder=None, keyframes=None, idle=None, templates=None,
+                 notes=None, mirror_flip=True):
+        self.session = session
+        self.channels = {"Left": channel, "Right": channel + 1}
+        self.sink = sink
+        self.hands_options = dict(HANDS_OPTIONS, **(hands_options or {}))
+        self.hands = None
+        self.tracker = tracker      # optional roi.RoiTracker: crop/downscale inference around last hands
+        self.recorder = recorder    # optional replay.LandmarkRecorder fed by detect()
+        self.keyframes = keyframes  # optional keyframe.KeyframeTracker: skip the model between keyframes
+        self.idle = idle            # optional idle.IdleGate: cheap motion check while no hands are around
+        self.templates = None       # optional templates.TemplateIndex: recorded poses before the rules
+        self.note_map = dict(NOTE_MAP)  # latched pose -> MIDI note (template names added by set_templates)
+        self.mirror_flip = mirror_flip  # flip directions if your webcam mirrors the image
+
+        self.state = {"Left": new_hand_state(), "Right": new_hand_state()}
+        self.hist = {"Left": MotionHistory(), "Right": MotionHistory()}
+        self.latches = {"Left": GestureLatch(notes=self.note_map), "Right": GestureLatch(notes=self.note_map)}
+        self._frame_t0 = 0.0  # capture time of the frame being classified (for latency metrics)
+        self._size = None     # (w, h) of the last detected frame
+        if templates is not None:
+            self.set_templates(templates, notes)
+
+    # -------- model --------
+    def get_hands(self):
+        """Build this engine's Hands model on first use."""
+        if self.hands is None:
+            self.hands = load_mediapipe().Hands(**self.hands_options)
+        return self.hands
+
+    def set_hands_options(self, **options):
+        """Change Hands() options (model_complexity, max_num_hands, ...); rebuilt on next use."""
+        self.hands_options.update(options)
+        if self.hands is not None:
+            self.hands.close()
+            self.hands = None
+
+    def warm_up(self, width=1080, height=420):
+        """Load the model and run one blank frame so the first real frame isn't slow."""
+        t0 = time.perf_counter()
+        model = self.get_hands()
+        model.process(np.zeros((height, width, 3), dtype=np.uint8))
+        METRICS.observe("warm_up", time.perf_counter() - t0)
+        return time.perf_counter() - t0
+
+    def hands_present(self, frame):
+        """Model-only check for any hand (idle probes); nothing is classified or recorded."""
+        result = self.get_hands().process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        METRICS.tick("probe")
+        return bool(result.multi_hand_landmarks)
+
+    def reset_tracking(self):
+        """Forget pixel-space history (wrist motion, ROI box, Kalman filters), e.g. after a resize."""
+        for hist in self.hist.values():
+            hist.clear()
+        if self.tracker is not None:
+            self.tracker.reset()
+        if self.keyframes is not None:
+            self.keyframes.reset()
+
+    def close(self):
+        if self.hands is not None:
+            self.hands.close()
+            self.hands = None
+        if self.sink is not None:
+            self.sink.close()
+
+    def set_templates(self, templates, notes=None):
+        """
+        Recognize poses with a templates.TemplateIndex (None = rules only).
+        notes: template name -> MIDI note; defaults to the notes saved with the templates.
+        Templates named after built-in poses (FIST, PEACE, ...) only help recognize them;
+        those poses keep their NOTE_MAP / CC_MAP messages.
+        """
+        self.templates = templates
+        if templates is None:
+            return
+        for name, note in (templates.notes if notes is None else notes).items():
+            if name in NOTE_MAP or name in CC_MAP:
+                print(f"⚠️ Template '{name}' is a built-in pose; keeping its built-in MIDI")
+                continue
+            self.note_map[name] = note
+
+    # -------- MIDI --------
+    def set_sink(self, sink):
+        """Route MIDI to a sinks.MidiSink (PortSink, BridgeSink, NullSink, RecordingSink)."""
+        self.sink = sink
+        return sink
+
+    def get_sink(self):
+        if self.sink is None:
+            self.sink = PortSink(DEFAULT_PORTS)
+        return self.sink
+
+    def _emit(self, msg):
+        # capture_to_midi is recorded by the sink once the message is really sent
+        self.get_sink().send(msg, self._frame_t0)
+        METRICS.incr("gesture_midi_events")
+
+    def send_midi_note(self, hand, note, velocity=100):
+        self._emit(Message('note_on', note=note, velocity=velocity, channel=self.channels.get(hand, 0)))
+
+    def send_midi_note_off(self, hand, note):
+        self._emit(Message('note_off', note=note, velocity=0, channel=self.channels.get(hand, 0)))
+
+    def send_midi_cc(self, hand, control, value):
+        self._emit(Message('control_change', control=control, value=int(value),
+                           channel=self.channels.get(hand, 0)))
+
+    # -------- pose latch --------
+    def fire_transition(self, label, released, entered):
+        """Note off / CC release for the old pose, then note on / CC for the new one."""
+        if released in self.note_map:
+            self.send_midi_note_off(label, self.note_map[released])
+        elif released in CC_MAP:
+            control, _, off = CC_MAP[released]
+            self.send_midi_cc(label, control, off)
+        if entered in self.note_map:
+            self.send_midi_note(label, self.note_map[entered])
+        elif entered in CC_MAP:
+            control, on, _ = CC_MAP[entered]
+            self.send_midi_cc(label, control, on)
+
+    def update_latch(self, label, pose, confidence=1.0):
+        latch = self.latches.get(label)
+        if latch is None:
+            latch = self.latches[label] = GestureLatch(notes=self.note_map)
+        change = latch.update(pose, confidence)
+        if change is not None:
+            self.fire_transition(label, *change)
+
+    def release_missing(self, present):
+        """Hands that vanished from the frame count as "no pose"."""
+        for label in self.latches:
+            if label not in present:
+                self.update_latch(label, None)
+
+    # -------- classification --------
+    def classify_hand_state(self, label, pts, static=None, ts=None, confidence=1.0, scale=1.0):
+        """
+        static: optional (gesture, up_count) already computed by classify_gestures.
+        ts: frame timestamp (seconds); motion is measured against real elapsed time.
+        confidence: handedness score, used to debounce the pose latch.
+        scale: pixels -> REF_WIDTH pixels, so swipe / volume thresholds ignore the capture size.
+        """
+        wrist = pts[0] if scale == 1.0 else pts[0] * (scale, scale, 1.0)
+        now = ts if ts is not None else time.time()
+        if static is None:
+            gestures, counts, _ = classify_gestures(pts[None], [label])
+            static = gestures[0], counts[0]
+        gesture, up_count = str(static[0]), int(static[1])
+        pose = gesture
+        state = self.state.setdefault(label, new_hand_state())
+
+        hist = self.hist.setdefault(label, MotionHistory())
+        if len(hist) and now < hist.t[hist.head]:
+            hist.clear()   # clock went backwards (e.g. a replay restarted)
+        hist.append(now, wrist)
+
+        motion = hist.window(MOTION_WINDOW)
+        if motion is not None:
+            dt, (dx, dy, dz), frame_dt = motion
+            vx = dx / dt
+            vz = dz / dt
+            # express travel over the reference window so pixel thresholds keep their meaning
+            dx *= MOTION_WINDOW / dt
+            dy *= MOTION_WINDOW / dt
+            # volume steps are scaled by how much time this frame represents
+            step = min(frame_dt / REF_FRAME_DT, 4.0)
+
+            # --- Swipe detection (any hand shape, facing camera) ---
+            if abs(vx) > 400 and vz > -0.004:  # detect faster sideways motion
+                direction = "RIGHT" if vx > 0 else "LEFT"
+                if self.mirror_flip:
+                    direction = "LEFT" if direction == "RIGHT" else "RIGHT"
+
+                last = state["last_swipe"]
+                if last["dir"] != direction or (now - last["time"] > 0.8):
+                    gesture += f"_SWIPE_{direction}"
+                    state["last_swipe"] = {
+                        "text": f"{label} SWIPED {direction.upper()}!",
+                        "time": now,
+                        "dir": direction
+                    }
+                    self.send_midi_note(label, note=64 if direction == "RIGHT" else 65)
+
+            # --- Vertical movement (volume control) ---
+            elif abs(dy) > 30 and abs(dy) > abs(dx):
+                vol = state["volume"]
+                vol += -dy * 0.1 * step
+                prev_vol = state["prev_volume"]
+                alpha = 0.3   # frame time is already in the step above; scaling it again would square it
+                smoothed = (1.0 - alpha) * prev_vol + alpha * vol
+                state["prev_volume"] = smoothed
+                state["volume"] = np.clip(smoothed, 0, 100)
+                self.send_midi_cc(label, 7, int(state["volume"]))
+
+        # Static gestures: MIDI only when the held pose changes (swipes don't break a hold)
+        self.update_latch(label, pose, confidence)
+
+        return gesture, up_count, state["volume"]
+
+    def classify_frame(self, labels, all_pts, ts=None, scores=None, size=None):
+        """
+        Classify every hand of one frame.
+        labels: handedness per hand, all_pts: (hands, 21, 3) pixel-space landmarks.
+        Shared by detect() and the landmark replay source.
+        ts: frame timestamp used for motion + results (defaults to now).
+        scores: handedness confidence per hand (defaults to 1.0).
+        size: (w, h) of the frame; adds the wrist position "pos" in 0..1.
+        """
+        self.release_missing(set(labels))
+        if not len(labels):
+            return []
+        if ts is None:
+            ts = time.time()
+        gestures, counts, _ = classify_gestures(all_pts, labels)
+        scale = REF_WIDTH / size[0] if size else 1.0
+        if self.templates is not None:
+            # a recorded pose within its own cutoff wins; the rules cover everything else
+            matched, _ = self.templates.match(all_pts, labels)
+            gestures = [m or g for m, g in zip(matched, gestures)]
+        outputs = []
+        for i, label in enumerate(labels):
+            gesture, count, volume = self.classify_hand_state(
+                label, all_pts[i], static=(gestures[i], counts[i]), ts=ts,
+                confidence=1.0 if scores is None else scores[i], scale=scale)
+            r = {
+                "hand": label,
+                "gesture": gesture,
+                "fingers": count,
+                "volume": int(volume),
+                "level": float(volume) / 100.0,   # unquantized volume for float outputs (OSC)
+                "ts": ts
+            }
+            if size is not None:
+                r["pos"] = (float(all_pts[i][0][0]) / size[0], float(all_pts[i][0][1]) / size[1])
+            if self.session is not None:
+                r["session"] = self.session
+            outputs.append(r)
+        return outputs
+
+    def detect(self, frame, t_capture=None, draw=True):
+        """
+        Detect hands, classify gestures, draw overlay, and return structured results.
+        t_capture: time.time() the frame was grabbed, for latency metrics.
+        draw: skip drawing landmarks into frame when nobody looks at it.
+        """
+        self._frame_t0 = t_capture or time.time()
+        size = (frame.shape[1], frame.shape[0])
+        if size != self._size:
+            if self._size is not None:
+                self.reset_tracking()   # capture resized (e.g. the governor): old pixels are stale
+            self._size = size
+        tracker, recorder, keyframes, idle = self.tracker, self.recorder, self.keyframes, self.idle
+        if idle is not None and idle.idle and not idle.wake(frame, self._frame_t0, self.hands_present):
+            METRICS.tick("idle")
+            return []
+        if keyframes is not None and not keyframes.due(self._frame_t0):
+            # in-between frame: classify Kalman-predicted landmarks, no model run
+            labels, all_pts, scores = keyframes.predict(self._frame_t0)
+            METRICS.tick("predicted")
+            return self.classify_frame(labels, all_pts, ts=self._frame_t0, scores=scores, size=size)
+        h, w, _ = frame.shape
+        if tracker is not None:
+            view, (x0, y0, vw, vh) = tracker.prepare(frame)
+        else:
+            view, (x0, y0, vw, vh) = frame, (0, 0, w, h)
+        img_rgb = cv2.cvtColor(view, cv2.COLOR_BGR2RGB)
+        model = self.get_hands()
+        t_inf = time.perf_counter()
+        result = model.process(img_rgb)
+        METRICS.observe("inference", time.perf_counter() - t_inf)
+        METRICS.since("capture_to_inference", self._frame_t0)
+        METRICS.tick("detect")
+
+        if not result.multi_hand_landmarks:
+            self.classify_frame([], None)
+            if keyframes is not None:
+                keyframes.observe([], None, None, self._frame_t0)
+            if idle is not None:
+                idle.observe(0)
+            if tracker is not None:
+                tracker.update(None, w, h)
+            if recorder is not None:
+                recorder.write(self._frame_t0, [], None, size=(w, h))
+            return []
+
+        labels = [hd.classification[0].label for hd in result.multi_handedness]
+        # (hands, 21, 3) in full-frame pixel space, scaled + offset in one op
+        all_pts = np.array([[(lm.x, lm.y, lm.z) for lm in handLms.landmark]
+                            for handLms in result.multi_hand_landmarks], dtype=np.float64)
+        all_pts *= (vw, vh, 1.0)
+        if x0 or y0:
+            all_pts += (x0, y0, 0.0)
+        if tracker is not None:
+            tracker.update(all_pts, w, h)
+        scores = [hd.classification[0].score for hd in result.multi_handedness]
+        if keyframes is not None:
+            keyframes.observe(labels, all_pts, scores, self._frame_t0)
+        if idle is not None:
+            idle.observe(len(labels))
+        if recorder is not None:
+            recorder.write(self._frame_t0, labels, all_pts, scores=scores, size=(w, h))
+
+        outputs = self.classify_frame(labels, all_pts, ts=self._frame_t0, scores=scores, size=(w, h))
+        METRICS.since("capture_to_classify", self._frame_t0)
+        if draw:
+            # landmarks are relative to the inference region; draw into that view of frame
+            canvas = frame[y0:y0 + vh, x0:x0 + vw]
+            for handLms in result.multi_hand_landmarks:
+                mp_draw.draw_landmarks(canvas, handLms, mp_hands.HAND_CONNECTIONS)
+        return outputs
 
 
+# ------------------------------------------------------------
+# Default engine: the single-performer module API
+# ------------------------------------------------------------
+engine = GestureEngine()
+
+state = engine.state
+latches = engine.latches
+left_hist = engine.hist["Left"]
+right_hist = engine.hist["Right"]
+
+get_hands = engine.get_hands
+warm_up = engine.warm_up
+set_sink = engine.set_sink
+get_sink = engine.get_sink
+set_templates = engine.set_templates
+send_midi_note = engine.send_midi_note
+send_midi_note_off = engine.send_midi_note_off
+send_midi_cc = engine.send_midi_cc
+update_latch = engine.update_latch
+release_missing = engine.release_missing
+classify_hand_state = engine.classify_hand_state
+classify_frame = engine.classify_frame
+detect = engine.detect
+
 # ------------------------------------------------------------
 # Run directly for debugging
 # ------------------------------------------------------------
 if __name__ == "__main__":
+    from overlay import OverlayRenderer
+
+    renderer = OverlayRenderer()
     cap = cv2.VideoCapture(0)
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
@@ -166,42 +557,7 @@ if __name__ == "__main__":
 
         frame = cv2.flip(frame, 1)
         results = detect(frame)
-        h, w, _ = frame.shape
-
-        left_x = 150
-        right_x = w // 2 + 200
-        y_base = 150
-
-        for r in results:
-            hand = r["hand"]
-            x_pos = left_x if hand == "Left" else right_x
-            y = y_base
-
-            overlay = frame.copy()
-            cv2.rectangle(overlay, (x_pos - 20, y - 40),
-                          (x_pos + 450, y + 130), (0, 0, 0), -1)
-            frame = cv2.addWeighted(overlay, 0.4, frame, 0.6, 0)
-
-            cv2.putText(frame, f"{hand}: {r['gesture']}", (x_pos, y),
-                        cv2.FONT_HERSHEY_DUPLEX, 1.0, (255, 0, 255), 2)
-            cv2.putText(frame, f"Fingers: {r['fingers']} | Vol: {r['volume']}",
-                        (x_pos, y + 50),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
-
-            # Volume bar
-            bar_x = x_pos
-            bar_y = h - 150
-            vol_height = int((r['volume'] / 100) * 300)
-            cv2.rectangle(frame, (bar_x, bar_y - vol_height),
-                          (bar_x + 60, bar_y), (0, 255, 0), -1)
-            cv2.rectangle(frame, (bar_x, bar_y - 300),
-                          (bar_x + 60, bar_y), (255, 255, 255), 3)
-
-            wave_info = state[hand]["last_swipe"]
-            if time.time() - wave_info["time"] < 1.5:
-                cv2.putText(frame, wave_info["text"],
-                            (x_pos, bar_y - 350),
-                            cv2.FONT_HERSHEY_DUPLEX, 1.1, (0, 255, 255), 3)
+        renderer.draw(frame, results, state)
 
         cv2.imshow("AirDJ — Any-Hand Swipe Tracker", frame)
         key = cv2.waitKey(1) & 0xFF
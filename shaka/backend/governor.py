@@ -0,0 +1,110 @@
+# governor.py
+# ------------------------------------------------------------
+# CPU-budget governor: degrade quality instead of lagging
+# ------------------------------------------------------------
+# The camera loop reports how long each frame took. When the smoothed
+# frame time stays over budget the governor applies the next step of
+# an ordered ladder (e.g. lower capture resolution, lighter model,
+# fewer hands, no overlay, lower MJPEG quality); when there is
+# headroom again it undoes the most recent step. Every transition is
+# handed to the registered listeners as an event dict:
+#   {"type": "governor", "action": "degrade" | "restore", "step": "resolution",
+#    "level": 1, "frame_ms": 41.2, "budget_ms": 30.0, "ts": ...}
+# ------------------------------------------------------------
+
+import time
+from collections import deque
+
+
+class Step:
+    """One rung of the ladder: degrade() applies it, restore() undoes it."""
+    def __init__(self, name, degrade, restore):
+        self.name = name
+        self.degrade = degrade
+        self.restore = restore
+        self.before = None   # smoothed frame time when the step was applied
+        self.after = None    # ... and once it had settled
+
+
+class Governor:
+    """
+    - observe(frame_time): feed one frame's processing time (seconds)
+    - level: number of steps currently applied (0 = full quality)
+    - on_change(fn): fn(event) for every transition
+    A step is only undone when the saving it was measured to bring
+    still leaves the frame time under budget * headroom.
+    """
+    def __init__(self, steps, budget=0.030, window=30, headroom=0.85, settle=3):
+        self.steps = list(steps)
+        self.budget = budget
+        self.window = window
+        self.headroom = headroom
+        self.settle = settle
+        self.alpha = 2.0 / (window + 1)
+
+        self.level = 0
+        self.avg = None
+        self._since = 0       # frames since the last transition
+        self._listeners = []
+        self.events = deque(maxlen=50)
+        self.transitions = 0
+
+    def on_change(self, fn):
+        self._listeners.append(fn)
+        return fn
+
+    def observe(self, frame_time):
+        self._since += 1
+        if self._since <= self.settle:
+            return None   # a transition itself can cost a slow frame (e.g. model rebuild)
+        if self.avg is None:
+            self.avg = frame_time
+        else:
+            self.avg += self.alpha * (frame_time - self.avg)
+        if self._since < self.settle + self.window:
+            return None
+
+        if self.level and self.steps[self.level - 1].after is None:
+            self.steps[self.level - 1].after = self.avg
+
+        if self.avg > self.budget and self.level < len(self.steps):
+            step = self.steps[self.level]
+            step.before, step.after = self.avg, None
+            step.degrade()
+            self.level += 1
+            return self._emit("degrade", step)
+
+        if self.level:
+            step = self.steps[self.level - 1]
+            gain = step.before / step.after if step.after else 1.0 / self.headroom
+            if self.avg * max(gain, 1.0) < self.budget * self.headroom:
+                step.restore()
+                self.level -= 1
+                return self._emit("restore", step)
+        return None
+
+    def _emit(self, action, step):
+        self._since = 0
+        self.transitions += 1
+        event = {
+            "type": "governor",
+            "action": action,
+            "step": step.name,
+            "level": self.level,
+            "frame_ms": round(1000 * self.avg, 2),
+            "budget_ms": round(1000 * self.budget, 2),
+            "ts": time.time(),
+        }
+        self.events.append(event)
+        for fn in self._listeners:
+            fn(event)
+        return event
+
+    def stats(self):
+        return {
+            "level": self.level,
+            "applied": [s.name for s in self.steps[:self.level]],
+            "frame_ms": round(1000 * self.avg, 2) if self.avg is not None else None,
+            "budget_ms": round(1000 * self.budget, 2),
+            "transitions": self.transitions,
+        }
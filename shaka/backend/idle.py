@@ -0,0 +1,92 @@
+# idle.py
+# ------------------------------------------------------------
+# Idle hand-presence gating
+# ------------------------------------------------------------
+# After `after` detections in a row found no hands, the engine stops
+# running the hand model on every frame. Each idle frame is shrunk to
+# a tiny blurred grayscale image and compared with the previous one;
+# enough changed pixels wake full detection on that same frame. Every
+# `probe_every` seconds a downscaled copy goes through the model too,
+# so a hand that slid in too slowly to trip the differencing still
+# wakes it. Probes only ask "any hands?": their landmarks never reach
+# the classifier (motion history stays in full-frame pixels).
+# ------------------------------------------------------------
+
+import cv2
+
+
+class IdleGate:
+    """
+    - observe(n_hands): after every full detection
+    - wake(frame, t, probe): while idle; True when full detection should run now
+      probe(small_frame) -> bool is the cheap low-res hand check
+    - idle: currently gating
+    """
+    def __init__(self, after=30, probe_every=0.5, probe_scale=0.4, diff_size=(64, 36),
+                 threshold=18, min_changed=0.01):
+        self.after = after
+        self.probe_every = probe_every
+        self.probe_scale = probe_scale
+        self.diff_size = diff_size
+        self.threshold = threshold
+        self.min_changed = int(min_changed * diff_size[0] * diff_size[1]) or 1
+
+        self.idle = False
+        self._empty = 0
+        self._prev = None
+        self._last_probe = 0.0
+
+        self.idle_frames = 0
+        self.probes = 0
+        self.wakes = {"motion": 0, "hand": 0}
+
+    def observe(self, n_hands):
+        if n_hands:
+            self._empty = 0
+            return
+        self._empty += 1
+        if self._empty >= self.after and not self.idle:
+            self.idle = True
+            self._prev = None
+            self._last_probe = 0.0
+
+    def _wake(self, reason):
+        self.wakes[reason] += 1
+        self.idle = False
+        self._empty = 0
+        self._prev = None
+        return True
+
+    def wake(self, frame, t, probe):
+        # bilinear to 2x the target then a 2:1 area step: near INTER_AREA quality for
+        # a fraction of its cost at arbitrary ratios
+        w, h = self.diff_size
+        small = cv2.resize(cv2.resize(frame, (2 * w, 2 * h), interpolation=cv2.INTER_LINEAR),
+                           self.diff_size, interpolation=cv2.INTER_AREA)
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (3, 3), 0)
+        prev, self._prev = self._prev, gray
+        if prev is not None:
+            diff = cv2.absdiff(gray, prev)
+            if cv2.countNonZero(cv2.threshold(diff, self.threshold, 255, cv2.THRESH_BINARY)[1]) \
+                    >= self.min_changed:
+                return self._wake("motion")
+
+        if t - self._last_probe >= self.probe_every:
+            self._last_probe = t
+            self.probes += 1
+            low = cv2.resize(frame, None, fx=self.probe_scale, fy=self.probe_scale,
+                             interpolation=cv2.INTER_LINEAR)
+            if probe(low):
+                return self._wake("hand")
+
+        self.idle_frames += 1
+        return False
+
+    def stats(self):
+        return {
+            "idle": self.idle,
+            "idle_frames": self.idle_frames,
+            "probes": self.probes,
+            "wakes_motion": self.wakes["motion"],
+            "wakes_hand": self.wakes["hand"],
+        }
@@ -1,19 +1,199 @@
+import heapq
+import logging
+import threading
+import time
+from collections import deque
 import mido
+from metrics import METRICS
+
+log = logging.getLogger("shaka.midi")
+
+
+class SampledLogger:
+    """Logs at most one message per `interval` seconds per key (keeps stdout off the hot path)."""
+    def __init__(self, logger, interval=1.0):
+        self.logger = logger
+        self.interval = interval
+        self._last = {}
+        self._skipped = {}
+
+    def log(self, key, fmt, *args, level=logging.INFO):
+        now = time.monotonic()
+        if now - self._last.get(key, 0.0) < self.interval:
+            self._skipped[key] = self._skipped.get(key, 0) + 1
+            return
+        skipped = self._skipped.pop(key, 0)
+        self._last[key] = now
+        if skipped:
+            fmt += " (+%d more)"
+            args = args + (skipped,)
+        self.logger.log(level, fmt, *args)
+
+
+class MidiScheduler:
+    """
+    Dedicated MIDI sender thread in front of a mido output port.
+    - send(msg, t_capture): queued, sent in order on the next wake-up
+    - cc(msg, t_capture): last-value-wins per (channel, control), flushed once per tick
+    - send_later(msg, delay): e.g. the note_off matching a note_on
+    - max_rate: messages/second cap (token bucket); excess waits for the next tick
+    Producers only append to a deque (atomic in CPython), never touch the port.
+    t_capture (frame capture time) rides along so capture_to_midi is recorded
+    when the message really goes out, queueing and coalescing included.
+    """
+    def __init__(self, port, tick=0.005, max_rate=1000.0):
+        self.port = port
+        self.tick = tick
+        self.max_rate = max_rate
+
+        self._inbox = deque()
+        self._wake = threading.Event()
+        self._running = True
+
+        self._ordered = deque()   # (msg, t_capture) notes / plain messages waiting for tokens
+        self._cc = {}             # (channel, control) -> latest (control_change, t_capture)
+        self._later = []          # heap of (due, seq, msg)
+        self._seq = 0
+        self._tokens = max_rate * tick if max_rate else 0.0
+        self._last_fill = time.perf_counter()
+        self._last_cc_flush = 0.0
+
+        self.sent = 0
+        self.coalesced = 0
+        self.deferred = 0
+
+        self._thread = threading.Thread(target=self._run, name="midi-out", daemon=True)
+        self._thread.start()
+
+    # -------- producer side (any thread) --------
+    def send(self, msg, t_capture=None):
+        self._inbox.append(("msg", (msg, t_capture)))
+        self._wake.set()
+
+    def cc(self, msg, t_capture=None):
+        self._inbox.append(("cc", (msg, t_capture)))
+        self._wake.set()
+
+    def send_later(self, msg, delay):
+        self._inbox.append(("later", (time.perf_counter() + delay, msg)))
+        self._wake.set()
+
+    # -------- sender thread --------
+    def _drain(self):
+        while self._inbox:
+            kind, payload = self._inbox.popleft()
+            if kind == "msg":
+                self._ordered.append(payload)
+            elif kind == "cc":
+                key = (payload[0].channel, payload[0].control)
+                if key in self._cc:
+                    self.coalesced += 1
+                self._cc[key] = payload
+            else:
+                due, msg = payload
+                self._seq += 1
+                heapq.heappush(self._later, (due, self._seq, msg))
+
+    def _take_token(self):
+        if not self.max_rate:
+            return True
+        now = time.perf_counter()
+        cap = max(1.0, self.max_rate * self.tick)
+        self._tokens = min(cap, self._tokens + (now - self._last_fill) * self.max_rate)
+        self._last_fill = now
+        if self._tokens < 1.0:
+            self.deferred += 1
+            return False
+        self._tokens -= 1.0
+        return True
+
+    def _out(self, msg, t_capture=None):
+        t0 = time.perf_counter()
+        try:
+            self.port.send(msg)
+        except Exception as e:
+            log.warning("MIDI send failed: %s", e)
+            return
+        METRICS.observe("midi_send", time.perf_counter() - t0)
+        METRICS.since("capture_to_midi", t_capture)
+        METRICS.incr("midi_messages")
+        self.sent += 1
+
+    def _flush(self, now):
+        while self._later and self._later[0][0] <= now:
+            self._ordered.append((heapq.heappop(self._later)[2], None))
+        while self._ordered:
+            if not self._take_token():
+                return
+            self._out(*self._ordered.popleft())
+        if self._cc and now - self._last_cc_flush >= self.tick:
+            self._last_cc_flush = now
+            for key in list(self._cc):
+                if not self._take_token():
+                    return
+                self._out(*self._cc.pop(key))
+
+    def _timeout(self, now):
+        waits = []
+        if self._ordered or self._cc:
+            waits.append(self.tick)
+        if self._later:
+            waits.append(max(0.0, self._later[0][0] - now))
+        return min(waits) if waits else None
+
+    def _run(self):
+        while self._running:
+            self._wake.wait(self._timeout(time.perf_counter()))
+            self._wake.clear()
+            self._drain()
+            self._flush(time.perf_counter())
+
+    def stop(self, flush=True):
+        """Stop the thread; with flush, pending messages and note_offs go out first."""
+        self._running = False
+        self._wake.set()
+        self._thread.join(timeout=1.0)
+        if flush:
+            self._drain()
+            self.max_rate = 0
+            self._ordered.extend((m, None) for _, _, m in sorted(self._later))
+            self._later.clear()
+            self._last_cc_flush = 0.0
+            self._flush(time.perf_counter() + self.tick)
+
+    def stats(self):
+        return {
+            "sent": self.sent,
+            "pending": len(self._inbox) + len(self._ordered) + len(self._cc),
+            "scheduled": len(self._later),
+            "coalesced": self.coalesced,
+            "rate_limited": self.deferred,
+        }
+
 
 class Bridge:
     """
     MIDI bridge for sending gestures to Ableton via loopMIDI.
     - Auto-selects a port that starts with "Shaka" if none provided.
-    - send(action, value): Note On for discrete actions
+    - send(action, value, duration): Note On for discrete actions (+ Note Off after duration)
+    - map_templates(names): pose template names become note_map actions
     - send_cc_named(cc_name, value01): CC by symbolic name (0..1 -> 0..127)
     - send_cc(cc_number, value01): CC by number (compat)
+    - async_out: messages go through a MidiScheduler thread instead of the caller's
     """
-    def __init__(self, midi_port: str = None):
+    def __init__(self, midi_port: str = None, port=None, async_out: bool = True,
+                 tick: float = 0.005, max_rate: float = 1000.0, note_length: float = None):
         self.outport = None
         self.port_name = None
+        self.sched = None
+        self.note_length = note_length
+        self._log = SampledLogger(log)
 
         try:
-            if midi_port:
+            if port is not None:
+                self.outport = port
+                self.port_name = getattr(port, "name", str(port))
+            elif midi_port:
                 self.outport = mido.open_output(midi_port)
                 self.port_name = midi_port
             else:
@@ -27,6 +207,9 @@ class Bridge:
             print(f"[Bridge] MIDI port error: {e}")
             self.outport = None
 
+        if self.outport and async_out:
+            self.sched = MidiScheduler(self.outport, tick=tick, max_rate=max_rate)
+
         # -------- Deck-specific notes --------
         # Left hand = Deck A (Track 1)
         # Right hand = Deck B (Track 2)
@@ -47,55 +230,121 @@ class Bridge:
             "XFADE": 1     # Crossfader (optional)
         }
 
-        self._last_cc = {}  
+        self._last_cc = {}
+
+    def _send(self, msg, t_capture=None):
+        if self.sched is not None:
+            if msg.type == "control_change":
+                self.sched.cc(msg, t_capture)
+            else:
+                self.sched.send(msg, t_capture)
+            return
+        t0 = time.perf_counter()
+        self.outport.send(msg)
+        METRICS.observe("midi_send", time.perf_counter() - t0)
+        METRICS.incr("midi_messages")
+        METRICS.since("capture_to_midi", t_capture)
+
+    def send_message(self, msg, t_capture=None):
+        """Send a ready-made mido Message (used by sinks.BridgeSink); t_capture for latency metrics."""
+        if not self.outport:
+            self._no_port()
+            return
+        self._send(msg, t_capture)
+
+    def _no_port(self):
+        self._log.log("no-port", "[Bridge] No MIDI output port. Is loopMIDI running?",
+                      level=logging.WARNING)
 
-    def send(self, action: str, value: float = 1.0):
-        """Send Note On for discrete actions (PLAY/STOP/TOGGLE)."""
+    def send(self, action: str, value: float = 1.0, duration: float = None):
+        """Send Note On for discrete actions (PLAY/STOP/TOGGLE); Note Off after `duration` s."""
         if not self.outport:
-            print("[Bridge] No MIDI output port. Is loopMIDI running?")
+            self._no_port()
             return
 
         note = self.note_map.get(action.upper())
         if note is None:
-            print(f"[Bridge] Unknown action '{action}'.")
+            self._log.log(f"unknown:{action}", "[Bridge] Unknown action '%s'.", action,
+                          level=logging.WARNING)
             return
 
         vel = int(max(0.0, min(1.0, value)) * 127)
         msg = mido.Message("note_on", note=note, velocity=vel)
-        self.outport.send(msg)
-        print(f"[MIDI NOTE] {action.upper()} → note {note}, velocity {vel}")
+        self._send(msg)
+        duration = duration if duration is not None else self.note_length
+        if duration:
+            off = mido.Message("note_off", note=note, velocity=0)
+            if self.sched is not None:
+                self.sched.send_later(off, duration)
+            else:
+                threading.Timer(duration, self._send, args=(off,)).start()
+        self._log.log("note", "[MIDI NOTE] %s → note %d, velocity %d", action.upper(), note, vel)
+
+    def map_templates(self, names, notes=None, base: int = 90, reserved=()):
+        """
+        Drive note_map from pose template names (templates.TemplateIndex.names).
+        Names already in note_map (e.g. a template recorded as "PLAY_A") keep their note;
+        explicit `notes` win; the rest get the next free notes from `base` up.
+        reserved: names with MIDI of their own (the built-in poses); never mapped.
+        Returns {template name: note} for the templates.
+        """
+        reserved = set(reserved)
+        names = [n for n in names if n not in reserved]
+        notes = {n: v for n, v in (notes or {}).items() if n not in reserved}
+        self.note_map.update({n.upper(): v for n, v in notes.items()})
+        used = set(self.note_map.values())
+        free = (n for n in range(base, 128) if n not in used)
+        mapped = {}
+        for name in names:
+            note = self.note_map.get(name.upper())
+            if note is None:
+                note = next(free, None)
+                if note is None:
+                    self._log.log("notes-full", "[Bridge] No free MIDI note for template '%s'.", name,
+                                  level=logging.WARNING)
+                    continue
+                self.note_map[name.upper()] = note
+            mapped[name] = note
+        return mapped
 
     def send_cc_named(self, cc_name: str, value01: float):
         """Send CC by symbolic name (e.g., 'VOL_A', 'VOL_B', 'XFADE')."""
         if not self.outport:
-            print("[Bridge] No MIDI output port. Is loopMIDI running?")
+            self._no_port()
             return
         cc_num = self.cc_map.get(cc_name)
         if cc_num is None:
-            print(f"[Bridge] Unknown CC '{cc_name}'.")
+            self._log.log(f"unknown:{cc_name}", "[Bridge] Unknown CC '%s'.", cc_name,
+                          level=logging.WARNING)
             return
         v = int(max(0.0, min(1.0, value01)) * 127)
         # --- de-dup: don't send if same value as last time for this CC ---
-        if self._last_cc.get(cc_num) == v:  
-            return                           
-        self._last_cc[cc_num] = v            
-        self.outport.send(mido.Message("control_change", control=cc_num, value=v))
-        print(f"[MIDI CC] {cc_name} (CC#{cc_num}) = {v}")
+        if self._last_cc.get(cc_num) == v:
+            return
+        self._last_cc[cc_num] = v
+        self._send(mido.Message("control_change", control=cc_num, value=v))
+        self._log.log("cc", "[MIDI CC] %s (CC#%d) = %d", cc_name, cc_num, v)
 
     def send_cc(self, cc_number: int, value01: float):
         """Send CC by number directly (kept for compatibility)."""
         if not self.outport:
-            print("[Bridge] No MIDI output port. Is loopMIDI running?")
+            self._no_port()
             return
         v = int(max(0.0, min(1.0, value01)) * 127)
         # --- de-dup ---
-        if self._last_cc.get(cc_number) == v:  
-            return                              
-        self._last_cc[cc_number] = v           
-        self.outport.send(mido.Message("control_change", control=cc_number, value=v))
-        print(f"[MIDI CC] CC#{cc_number} = {v}")
+        if self._last_cc.get(cc_number) == v:
+            return
+        self._last_cc[cc_number] = v
+        self._send(mido.Message("control_change", control=cc_number, value=v))
+        self._log.log("cc", "[MIDI CC] CC#%d = %d", cc_number, v)
+
+    def stats(self):
+        return self.sched.stats() if self.sched is not None else {}
 
     def close(self):
+        if self.sched is not None:
+            self.sched.stop(flush=True)
+            self.sched = None
         if self.outport:
             self.outport.close()
             print("[Bridge] MIDI port closed.")
@@ -0,0 +1,138 @@
+# keyframe.py
+# ------------------------------------------------------------
+# Keyframe inference: run the hand model every Nth frame only
+# ------------------------------------------------------------
+# Between model runs every landmark is extrapolated with a constant-
+# velocity Kalman filter, so classification still runs on every frame.
+# N adapts to hand speed: the model runs again before the fastest
+# landmark can have moved more than `budget` pixels since the last
+# keyframe (and never less often than every max_interval frames).
+# Frames with no hands, or with hands appearing / leaving, always run
+# the model.
+# ------------------------------------------------------------
+
+import numpy as np
+
+
+class LandmarkKalman:
+    """
+    Constant-velocity Kalman filter over all (21, 3) landmarks of one hand.
+    Every coordinate has the same motion and measurement model, so the
+    2x2 [position, velocity] covariance is shared and the update is one
+    vectorized step.
+    - update(pts, t): fold in a detection
+    - predict(t): extrapolated landmarks at time t (state untouched)
+    - speed(): fastest landmark speed in the image plane, px/s
+    """
+    def __init__(self, pts, t, accel=2e5, noise=3.0):
+        self.q = accel             # white-acceleration spectral density, px^2/s^3
+        self.r = noise * noise     # measurement variance, px^2
+        self.x = np.zeros((2,) + np.shape(pts))
+        self.x[0] = pts
+        self.P = np.array([[self.r, 0.0], [0.0, 1e8]])   # velocity unknown at first
+        self.t = t
+
+    def update(self, pts, t):
+        dt = max(t - self.t, 1e-3)
+        self.x[0] += dt * self.x[1]
+        P = self.P
+        p00 = P[0, 0] + dt * (2 * P[0, 1] + dt * P[1, 1]) + self.q * dt ** 3 / 3
+        p01 = P[0, 1] + dt * P[1, 1] + self.q * dt ** 2 / 2
+        p11 = P[1, 1] + self.q * dt
+        s = p00 + self.r
+        k0, k1 = p00 / s, p01 / s
+        resid = pts - self.x[0]
+        self.x[0] += k0 * resid
+        self.x[1] += k1 * resid
+        self.P = np.array([[(1 - k0) * p00, (1 - k0) * p01],
+                           [p01 - k1 * p00, p11 - k1 * p01]])
+        self.t = t
+
+    def predict(self, t):
+        return self.x[0] + (t - self.t) * self.x[1]
+
+    def speed(self):
+        return float(np.sqrt((self.x[1, :, :2] ** 2).sum(axis=1)).max())
+
+
+class KeyframeTracker:
+    """
+    Decides per frame whether the hand model has to run.
+    - due(t): True when this frame needs a real detection
+    - observe(labels, pts, scores, t): feed a detection (a keyframe)
+    - predict(t): (labels, pts, scores) extrapolated to t for an in-between frame
+    - interval: current N, from the fastest landmark speed at the last keyframe
+    - reset(): drop the filters (e.g. the frame size changed); next frame is a keyframe
+    """
+    def __init__(self, max_interval=4, budget=40.0, accel=2e5, noise=3.0):
+        self.max_interval = max_interval
+        self.budget = budget
+        self.accel = accel
+        self.noise = noise
+
+        self.labels = []
+        self.scores = []
+        self.filters = []
+        self.interval = 1
+        self.t_key = 0.0
+        self.since_key = 0
+        self.frame_dt = 1 / 30
+        self._t_last = None
+
+        self.keyframes = 0
+        self.predicted = 0
+
+    def _tick(self, t):
+        if self._t_last is not None and t > self._t_last:
+            self.frame_dt += 0.1 * ((t - self._t_last) - self.frame_dt)
+        self._t_last = t
+
+    def speed(self):
+        return max((f.speed() for f in self.filters), default=0.0)
+
+    def due(self, t):
+        if not self.filters or self.since_key + 1 >= self.interval:
+            return True
+        # predicted travel since the keyframe is getting too large to trust
+        return self.speed() * (t - self.t_key) > self.budget
+
+    def observe(self, labels, pts, scores, t):
+        self._tick(t)
+        self.keyframes += 1
+        self.since_key = 0
+        self.t_key = t
+        labels = list(labels)
+        if labels != self.labels:
+            # hands appeared, left or swapped: start over
+            self.filters = [LandmarkKalman(p, t, self.accel, self.noise) for p in (pts if labels else [])]
+            self.interval = 1
+        else:
+            for f, p in zip(self.filters, pts):
+                f.update(p, t)
+            step = self.speed() * self.frame_dt
+            n = int(self.budget / step) if step > 0 else self.max_interval
+            self.interval = max(1, min(self.max_interval, n))
+        self.labels = labels
+        self.scores = list(scores) if scores is not None else [1.0] * len(labels)
+
+    def reset(self):
+        self.labels = []
+        self.scores = []
+        self.filters = []
+        self.interval = 1
+
+    def predict(self, t):
+        self._tick(t)
+        self.predicted += 1
+        self.since_key += 1
+        pts = np.stack([f.predict(t) for f in self.filters])
+        return self.labels, pts, self.scores
+
+    def stats(self):
+        total = self.keyframes + self.predicted
+        return {
+            "interval": self.interval,
+            "keyframes": self.keyframes,
+            "predicted": self.predicted,
+            "keyframe_ratio": round(self.keyframes / total, 3) if total else 1.0,
+        }
@@ -0,0 +1,125 @@
+# metrics.py
+# ------------------------------------------------------------
+# Glass-to-MIDI latency + throughput metrics
+# ------------------------------------------------------------
+# Stages are timed from the moment a frame was captured:
+#   capture_to_inference  hands.process() finished
+#   capture_to_classify   gestures classified
+#   capture_to_midi       MIDI message sent on the port (after scheduler queueing)
+#   capture_to_ws         WebSocket fan-out finished
+# Each stage keeps a rolling window of samples; snapshot() returns
+# p50/p95/p99 in milliseconds plus counters, FPS meters and any
+# registered stats sources (capture, pipeline, video hub...).
+# ------------------------------------------------------------
+
+import threading
+import time
+from collections import deque
+import numpy as np
+
+
+class RollingHistogram:
+    """Last `size` samples (seconds) with percentile summary in ms."""
+    def __init__(self, size=1024):
+        self._samples = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, seconds):
+        self._samples.append(seconds)
+        self.count += 1
+
+    def summary(self):
+        if not self._samples:
+            return {"count": self.count}
+        ms = np.fromiter(self._samples, dtype=np.float64) * 1000.0
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        return {
+            "count": self.count,
+            "p50": round(float(p50), 2),
+            "p95": round(float(p95), 2),
+            "p99": round(float(p99), 2),
+            "max": round(float(ms.max()), 2),
+        }
+
+
+class RateMeter:
+    """Events per second over the last `size` events."""
+    def __init__(self, size=120):
+        self._times = deque(maxlen=size)
+
+    def tick(self, now=None):
+        self._times.append(now if now is not None else time.perf_counter())
+
+    def rate(self):
+        if len(self._times) < 2:
+            return 0.0
+        span = self._times[-1] - self._times[0]
+        return (len(self._times) - 1) / span if span > 0 else 0.0
+
+
+class Metrics:
+    """
+    Thread-safe registry shared by capture, gestures, io_bridge and run_time.
+    - observe(stage, seconds) / since(stage, t_capture)
+    - incr(counter, n) / tick(meter)
+    - add_source(name, fn): fn() -> dict merged into snapshot()
+    """
+    def __init__(self, window=1024):
+        self.window = window
+        self._lock = threading.Lock()
+        self._hists = {}
+        self._counters = {}
+        self._meters = {}
+        self._sources = {}
+        self.started = time.time()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            hist = self._hists.get(stage)
+            if hist is None:
+                hist = self._hists[stage] = RollingHistogram(self.window)
+            hist.add(seconds)
+
+    def since(self, stage, t_capture):
+        """Record wall-clock time elapsed since t_capture (time.time())."""
+        if t_capture:
+            self.observe(stage, time.time() - t_capture)
+
+    def incr(self, name, n=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def tick(self, name):
+        with self._lock:
+            meter = self._meters.get(name)
+            if meter is None:
+                meter = self._meters[name] = RateMeter()
+            meter.tick()
+
+    def add_source(self, name, fn):
+        self._sources[name] = fn
+
+    def snapshot(self):
+        with self._lock:
+            out = {
+                "uptime": round(time.time() - self.started, 1),
+                "latency_ms": {k: h.summary() for k, h in self._hists.items()},
+                "fps": {k: round(m.rate(), 1) for k, m in self._meters.items()},
+                "counters": dict(self._counters),
+            }
+        for name, fn in list(self._sources.items()):
+            try:
+                out[name] = fn()
+            except Exception as e:
+                out[name] = {"error": str(e)}
+        return out
+
+    def reset(self):
+        with self._lock:
+            self._hists.clear()
+            self._counters.clear()
+            self._meters.clear()
+            self.started = time.time()
+
+
+METRICS = Metrics()
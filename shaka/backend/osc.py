@@ -0,0 +1,267 @@
+# osc.py
+# ------------------------------------------------------------
+# OSC over UDP: fire-and-forget gesture output for visuals
+# ------------------------------------------------------------
+# Per hand (prefix /shaka/<hand>, or /shaka/<session>/<hand> with
+# several engines), lower-case hand names:
+#   /shaka/left/state    ,ifff   fingers, level 0..1, x 0..1, y 0..1
+#   /shaka/left/gesture  ,s      gesture name; only when it changes,
+#                                "NONE" when the hand leaves
+# level and position keep full float resolution (no 7-bit CC).
+# State packets are preallocated per hand and refilled in place with
+# struct.pack_into; gesture packets are cached per name. With
+# bundle=True a frame's messages go out as one #bundle datagram,
+# timetagged with the capture time.
+# Destinations are "host:port" strings, resolved once up front;
+# multicast groups (224/4) get a TTL and loopback so a listener on the
+# same machine sees them.
+#
+# Listen: python osc.py listen --port 9000 [--group 239.0.0.1]
+# ------------------------------------------------------------
+
+import argparse
+import ipaddress
+import socket
+import struct
+import time
+
+NTP_EPOCH = 2208988800   # seconds from 1900-01-01 to the Unix epoch
+IMMEDIATE = 1            # OSC timetag "now"
+STATE = struct.Struct(">ifff")
+BUNDLE_HEAD = b"#bundle\0"
+MAX_DATAGRAM = 1472      # fits one Ethernet frame
+
+
+def osc_string(s):
+    b = s.encode() + b"\0"
+    return b + b"\0" * (-len(b) % 4)
+
+
+def osc_message(address, tags="", *args):
+    """Generic encoder (i, f, s, d, h); the hot path uses preallocated packets instead."""
+    out = [osc_string(address), osc_string("," + tags)]
+    for tag, arg in zip(tags, args):
+        if tag == "s":
+            out.append(osc_string(arg))
+        else:
+            out.append(struct.pack(">" + tag.replace("h", "q"), arg))
+    return b"".join(out)
+
+
+def timetag(ts):
+    if ts is None:
+        return IMMEDIATE
+    secs = ts + NTP_EPOCH
+    return (int(secs) << 32) | int((secs % 1) * (1 << 32))
+
+
+def parse(packet):
+    """Datagram -> list of (address, args); bundles are flattened."""
+    if packet.startswith(BUNDLE_HEAD):
+        out, i = [], 16
+        while i < len(packet):
+            (size,) = struct.unpack_from(">i", packet, i)
+            out.extend(parse(packet[i + 4:i + 4 + size]))
+            i += 4 + size
+        return out
+
+    def read_string(i):
+        end = packet.index(b"\0", i)
+        return packet[i:end].decode(), end + 1 + (-(end + 1) % 4)
+
+    address, i = read_string(0)
+    tags, i = read_string(i)
+    args = []
+    for tag in tags[1:]:
+        if tag == "s":
+            s, i = read_string(i)
+            args.append(s)
+        else:
+            fmt = {"i": ">i", "f": ">f", "d": ">d", "h": ">q"}[tag]
+            args.append(struct.unpack_from(fmt, packet, i)[0])
+            i += struct.calcsize(fmt)
+    return [(address, args)]
+
+
+def parse_destinations(spec):
+    """"127.0.0.1:9000,239.0.0.1:9001" -> [("127.0.0.1", 9000), ("239.0.0.1", 9001)]"""
+    dests = []
+    for item in (spec or "").split(","):
+        if item.strip():
+            host, port = item.strip().rsplit(":", 1)
+            dests.append((host, int(port)))
+    return dests
+
+
+def resolve(destinations):
+    """(host, port) pairs -> (IPv4 address, port); hosts that don't resolve are skipped."""
+    out = []
+    for host, port in destinations:
+        try:
+            addr = socket.getaddrinfo(host, int(port), socket.AF_INET, socket.SOCK_DGRAM)[0][4]
+        except socket.gaierror as e:
+            print(f"[OSC] Can't resolve {host}:{port} ({e}); skipping")
+            continue
+        out.append(addr)
+    return out
+
+
+class HandPackets:
+    """Preallocated state packet + cached gesture packets for one address prefix."""
+    def __init__(self, prefix):
+        head = osc_string(prefix + "/state") + osc_string(",ifff")
+        self.state = bytearray(head + bytes(STATE.size))
+        self.offset = len(head)
+        self.gesture_addr = osc_string(prefix + "/gesture") + osc_string(",s")
+        self._gestures = {}
+        self.gesture = None
+
+    def pack_state(self, fingers, level, x, y):
+        STATE.pack_into(self.state, self.offset, fingers, level, x, y)
+        return self.state
+
+    def gesture_packet(self, name):
+        pkt = self._gestures.get(name)
+        if pkt is None:
+            pkt = self._gestures[name] = self.gesture_addr + osc_string(name)
+        return pkt
+
+
+class OscOutput:
+    """
+    - send_results(results, session, ts): one frame of detect() results
+    - bundle: one #bundle datagram per frame instead of one per message
+    Sends never block: a full socket buffer drops the datagram and counts it.
+    """
+    def __init__(self, destinations, bundle=False, ttl=1, prefix="/shaka"):
+        self.destinations = resolve(destinations)
+        self.bundle = bundle
+        self.prefix = prefix
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        if any(ipaddress.ip_address(h).is_multicast for h, _ in self.destinations):
+            self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+            self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+
+        self._hands = {}      # (session, hand) -> HandPackets
+        self._present = {}    # session -> hands seen in its last frame
+        self._bundle = bytearray(MAX_DATAGRAM)
+        self._bundle[:8] = BUNDLE_HEAD
+        self._parts = []
+
+        self.sent = 0
+        self.dropped = 0
+        self.frames = 0
+
+    def _packets(self, session, hand):
+        key = (session, hand)
+        pk = self._hands.get(key)
+        if pk is None:
+            name = hand.lower()
+            prefix = f"{self.prefix}/{session}/{name}" if session is not None else f"{self.prefix}/{name}"
+            pk = self._hands[key] = HandPackets(prefix)
+        return pk
+
+    def _out(self, data):
+        for dest in self.destinations:
+            try:
+                self.sock.sendto(data, dest)
+                self.sent += 1
+            except (BlockingIOError, OSError):
+                self.dropped += 1
+
+    def _emit(self, data):
+        if self.bundle:
+            self._parts.append(bytes(data))   # state buffers are reused per hand
+        else:
+            self._out(data)
+
+    def _flush(self, ts):
+        parts, self._parts = self._parts, []
+        if not parts:
+            return
+        buf = self._bundle
+        struct.pack_into(">Q", buf, 8, timetag(ts))
+        i = 16
+        for p in parts:
+            if i + 4 + len(p) > len(buf):
+                self._out(bytes(buf[:i]))   # full: ship what fits, start a new bundle
+                i = 16
+            struct.pack_into(">i", buf, i, len(p))
+            buf[i + 4:i + 4 + len(p)] = p
+            i += 4 + len(p)
+        self._out(memoryview(buf)[:i])
+
+    def send_results(self, results, session=None, ts=None):
+        present = set()
+        for r in results:
+            hand = r.get("hand", "Unknown")
+            present.add(hand)
+            pk = self._packets(session, hand)
+            x, y = r.get("pos") or (0.0, 0.0)
+            level = r.get("level", r.get("volume", 0) / 100.0)
+            self._emit(pk.pack_state(int(r.get("fingers", 0)), level, x, y))
+            gesture = str(r.get("gesture", "NONE"))
+            if gesture != pk.gesture:
+                pk.gesture = gesture
+                self._emit(pk.gesture_packet(gesture))
+        for hand in self._present.get(session, set()) - present:
+            pk = self._packets(session, hand)
+            pk.gesture = "NONE"
+            self._emit(pk.gesture_packet("NONE"))
+        self._present[session] = present
+        if self.bundle:
+            self._flush(ts)
+        self.frames += 1
+
+    def stats(self):
+        return {"destinations": len(self.destinations), "frames": self.frames,
+                "sent": self.sent, "dropped": self.dropped, "bundle": self.bundle}
+
+    def close(self):
+        self.sock.close()
+
+
+class OscListener:
+    """Local UDP receiver (checks, tools); joins `group` for multicast."""
+    def __init__(self, port, host="0.0.0.0", group=None):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, port))
+        self.port = self.sock.getsockname()[1]
+        if group:
+            mreq = socket.inet_aton(group) + socket.inet_aton("0.0.0.0")
+            self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
+
+    def recv(self, timeout=1.0):
+        """Next datagram as [(address, args), ...], or None on timeout."""
+        self.sock.settimeout(timeout)
+        try:
+            data, _ = self.sock.recvfrom(65536)
+        except socket.timeout:
+            return None
+        return parse(data)
+
+    def close(self):
+        self.sock.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print OSC messages from run_time.py")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    lis = sub.add_parser("listen")
+    lis.add_argument("--port", type=int, default=9000)
+    lis.add_argument("--group", help="multicast group to join")
+    args = parser.parse_args()
+
+    listener = OscListener(args.port, group=args.group)
+    print(f"[OSC] Listening on :{listener.port}" + (f" ({args.group})" if args.group else ""))
+    try:
+        while True:
+            msgs = listener.recv(1.0)
+            for address, values in msgs or ():
+                print(f"{time.time():.3f} {address} {values}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
@@ -0,0 +1,132 @@
+# overlay.py
+# ------------------------------------------------------------
+# Cheap per-hand overlay: info box, volume bar, swipe banner
+# ------------------------------------------------------------
+# Same picture as the old draw loop, drawn in place:
+#   - only the box behind each hand's text is darkened (no full-frame
+#     copy + addWeighted per hand)
+#   - each label is rasterized once into a coverage mask (antialiased
+#     text included) and stamped with two saturating ops on its box:
+#     dst = dst * (255 - a) / 255 + colour * a / 255
+# Callers skip it entirely when nobody watches /video_feed.
+# ------------------------------------------------------------
+
+import time
+import cv2
+import numpy as np
+
+LEFT_X = 150
+RIGHT_OFFSET = 200     # right hand column starts at w // 2 + this
+Y_BASE = 150
+BOX = (-20, -40, 450, 130)   # darkened box around the text, relative to (x, y)
+BOX_ALPHA = 0.6              # brightness kept under the box (old overlay 0.4 black)
+BAR_W, BAR_H, BAR_BOTTOM = 60, 300, 150
+SWIPE_SHOW = 1.5       # seconds a swipe banner stays up
+
+MAGENTA, WHITE, GREEN, CYAN, RED = (255, 0, 255), (255, 255, 255), (0, 255, 0), (0, 255, 255), (0, 0, 255)
+
+
+class OverlayRenderer:
+    """
+    - draw(frame, results, state): draws into frame and returns it
+      state: optional gestures state dict, for the swipe banner
+    - text(...) / darken(...): the in-place primitives draw() is made of
+    The sprite cache is bounded by max_sprites.
+    """
+    def __init__(self, max_sprites=512):
+        self.max_sprites = max_sprites
+        self._sprites = {}   # key + colour -> (keep, paint, dx, dy)
+        self.hits = 0
+        self.misses = 0
+
+    # -------- sprite cache --------
+    def _sprite(self, key, color, render):
+        """render() -> (coverage mask, dx, dy); cached premultiplied for this colour."""
+        key = key + (color,)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            self.misses += 1
+            if len(self._sprites) >= self.max_sprites:
+                self._sprites.clear()
+            mask, dx, dy = render()
+            cover = cv2.merge([mask] * 3)
+            keep = cv2.bitwise_not(cover)
+            paint = np.empty_like(cover)
+            paint[:] = color
+            cv2.multiply(paint, cover, dst=paint, scale=1 / 255)
+            sprite = self._sprites[key] = (keep, paint, dx, dy)
+        else:
+            self.hits += 1
+        return sprite
+
+    @staticmethod
+    def _stamp(frame, sprite, x, y):
+        """Blend a cached sprite with its mask origin at (x, y), clipped to frame."""
+        keep, paint, dx, dy = sprite
+        x, y = x - dx, y - dy
+        fh, fw = frame.shape[:2]
+        mh, mw = keep.shape[:2]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + mw, fw), min(y + mh, fh)
+        if x0 >= x1 or y0 >= y1:
+            return
+        roi = frame[y0:y1, x0:x1]
+        cut = (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+        cv2.multiply(roi, keep[cut], dst=roi, scale=1 / 255)
+        cv2.add(roi, paint[cut], dst=roi)
+
+    # -------- primitives --------
+    def text(self, frame, text, org, font, scale, color, thickness):
+        """Same pixels as cv2.putText(frame, text, org, ...), from a cached mask."""
+        def render():
+            (tw, th), base = cv2.getTextSize(text, font, scale, thickness)
+            pad = thickness + 1
+            mask = np.zeros((th + base + 2 * pad, tw + 2 * pad), dtype=np.uint8)
+            cv2.putText(mask, text, (pad, pad + th), font, scale, 255, thickness)
+            return mask, pad, pad + th
+        self._stamp(frame, self._sprite((text, font, scale, thickness), color, render), *org)
+
+    @staticmethod
+    def darken(frame, x0, y0, x1, y1, alpha=BOX_ALPHA):
+        """Scale the inclusive box (x0, y0)-(x1, y1) by alpha, in place."""
+        h, w = frame.shape[:2]
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1 + 1, w), min(y1 + 1, h)
+        if x0 < x1 and y0 < y1:
+            roi = frame[y0:y1, x0:x1]
+            cv2.addWeighted(roi, alpha, roi, 0, 0, dst=roi)
+
+    # -------- full overlay --------
+    def draw(self, frame, results, state=None, now=None):
+        h, w = frame.shape[:2]
+        if not results:
+            self.text(frame, "No hands detected", (int(w / 2) - 200, int(h / 2)),
+                      cv2.FONT_HERSHEY_DUPLEX, 1.2, RED, 3)
+            return frame
+        now = now if now is not None else time.time()
+        for r in results:
+            hand = r.get("hand", "Unknown")
+            x = LEFT_X if hand == "Left" else w // 2 + RIGHT_OFFSET
+            y = Y_BASE
+
+            self.darken(frame, x + BOX[0], y + BOX[1], x + BOX[2], y + BOX[3])
+            self.text(frame, f"{hand}: {r.get('gesture', 'None')}", (x, y),
+                      cv2.FONT_HERSHEY_DUPLEX, 1.0, MAGENTA, 2)
+            vol = r.get("volume", 0)
+            self.text(frame, f"Fingers: {r.get('fingers', 0)}  |  Vol: {vol}", (x, y + 50),
+                      cv2.FONT_HERSHEY_SIMPLEX, 0.9, WHITE, 2)
+
+            # volume bar (plain rectangles are cheaper to draw than to stamp)
+            bar_y = h - BAR_BOTTOM
+            fill = int((vol / 100) * BAR_H)
+            cv2.rectangle(frame, (x, bar_y - fill), (x + BAR_W, bar_y), GREEN, -1)
+            cv2.rectangle(frame, (x, bar_y - BAR_H), (x + BAR_W, bar_y), WHITE, 3)
+
+            swipe = state.get(hand, {}).get("last_swipe") if state else None
+            if swipe and now - swipe["time"] < SWIPE_SHOW:
+                self.text(frame, swipe["text"], (x, bar_y - 350),
+                          cv2.FONT_HERSHEY_DUPLEX, 1.1, CYAN, 3)
+        return frame
+
+    def stats(self):
+        return {"sprites": len(self._sprites), "hits": self.hits, "misses": self.misses}
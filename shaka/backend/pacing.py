@@ -0,0 +1,78 @@
+# pacing.py
+# ------------------------------------------------------------
+# Frame-paced scheduler for the camera loop
+# ------------------------------------------------------------
+# Instead of sleeping a flat 50 ms after every frame, the loop sleeps
+# only for what is left of the frame budget. Deadlines advance by one
+# period per frame; a frame that starts a whole period or more after
+# its slot (e.g. the camera delivers slower than the target) restarts
+# the schedule from its own start (no catch-up bursts). Waiting for
+# input is never a miss: only a frame whose own work overruns the
+# period counts as one.
+# ------------------------------------------------------------
+
+import asyncio
+import time
+
+
+class FramePacer:
+    """
+    - begin(): mark the start of a frame's work
+    - wait() / wait_sync(): sleep for the rest of the budget (async / thread)
+    - behind: True when the previous frame's own work took longer than a period
+    - target_fps <= 0 runs unpaced (just yields)
+    """
+    def __init__(self, target_fps=30.0):
+        self.set_fps(target_fps)
+        self._deadline = None
+        self._t0 = None
+        self.frames = 0
+        self.misses = 0
+        self.behind = False
+        self.busy = 0.0
+
+    def set_fps(self, target_fps):
+        self.target_fps = target_fps
+        self.period = 1.0 / target_fps if target_fps and target_fps > 0 else 0.0
+
+    def begin(self):
+        self._t0 = time.perf_counter()
+        if not self.period:
+            return
+        if self._deadline is None or self._t0 - self._deadline >= self.period:
+            self._deadline = self._t0 + self.period
+        else:
+            self._deadline += self.period
+
+    def _advance(self):
+        """Close the current frame; returns seconds to sleep."""
+        now = time.perf_counter()
+        self.frames += 1
+        if self._t0 is not None:
+            self.busy += now - self._t0
+        if not self.period:
+            self.behind = False
+            return 0.0
+        if self._t0 is None:
+            self.begin()   # wait() without begin(): the frame ran from here
+        work, self._t0 = now - self._t0, None
+        self.behind = work > self.period
+        if self.behind:
+            self.misses += 1
+        return max(0.0, self._deadline - now)
+
+    async def wait(self):
+        await asyncio.sleep(self._advance())
+
+    def wait_sync(self):
+        rest = self._advance()
+        if rest > 0:
+            time.sleep(rest)
+
+    def stats(self):
+        return {
+            "target_fps": self.target_fps,
+            "frames": self.frames,
+            "deadline_misses": self.misses,
+            "avg_busy_ms": round(1000 * self.busy / self.frames, 2) if self.frames else 0.0,
+        }
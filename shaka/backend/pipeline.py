@@ -0,0 +1,135 @@
+# pipeline.py
+# ------------------------------------------------------------
+# Threaded stage pipeline (capture -> inference -> overlay)
+# ------------------------------------------------------------
+# Each Stage runs one function on its own worker thread and hands its
+# output to the next stage through a small bounded queue. When a queue
+# is full the oldest item is dropped: for a live camera feed a stale
+# frame is worth less than a fresh one.
+# ------------------------------------------------------------
+
+import threading
+import time
+from collections import deque
+
+
+class BoundedQueue:
+    """
+    Small thread-safe FIFO that drops the oldest item when full.
+    - put(item): never blocks
+    - get(timeout): item or None on timeout
+    """
+    def __init__(self, maxsize=2):
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout):
+                return None
+            return self._items.popleft()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class Stage:
+    """
+    One pipeline stage on a worker thread.
+    - source(timeout) -> item or None
+    - fn(item) -> result, or None to pass nothing downstream
+    - outbox: optional BoundedQueue for the next stage
+    - pacer: optional pacing.FramePacer limiting the stage to its target FPS
+    """
+    def __init__(self, name, fn, source, outbox=None, pacer=None):
+        self.name = name
+        self.fn = fn
+        self.source = source
+        self.outbox = outbox
+        self.pacer = pacer
+
+        self.processed = 0
+        self.errors = 0
+        self.busy = 0.0
+        self._window = deque(maxlen=120)   # completion times for throughput
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while self._running:
+            item = self.source(0.5)
+            if item is None:
+                continue
+            t0 = time.perf_counter()
+            if self.pacer is not None:
+                self.pacer.begin()
+            try:
+                out = self.fn(item)
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️ {self.name} stage error: {e}")
+                out = None
+            t1 = time.perf_counter()
+            self.busy += t1 - t0
+            self.processed += 1
+            self._window.append(t1)
+            if self.outbox is not None and out is not None:
+                self.outbox.put(out)
+            if self.pacer is not None:
+                self.pacer.wait_sync()
+
+    def throughput(self):
+        """Items per second over the recent window."""
+        if len(self._window) < 2:
+            return 0.0
+        span = self._window[-1] - self._window[0]
+        return (len(self._window) - 1) / span if span > 0 else 0.0
+
+    def stats(self):
+        out = {
+            "processed": self.processed,
+            "fps": round(self.throughput(), 1),
+            "avg_ms": round(1000 * self.busy / self.processed, 2) if self.processed else 0.0,
+            "errors": self.errors,
+        }
+        if self.outbox is not None:
+            out["queue_depth"] = len(self.outbox)
+            out["queue_dropped"] = self.outbox.dropped
+        return out
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+
+
+class Pipeline:
+    """Ordered group of stages started/stopped together."""
+    def __init__(self, *stages):
+        self.stages = list(stages)
+
+    def start(self):
+        for s in self.stages:
+            s.start()
+        return self
+
+    def stats(self):
+        return {s.name: s.stats() for s in self.stages}
+
+    def stop(self):
+        for s in self.stages:
+            s.stop()
@@ -0,0 +1,177 @@
+# replay.py
+# ------------------------------------------------------------
+# Landmark record / replay (camera-free pipeline runs)
+# ------------------------------------------------------------
+# A recording is two files:
+#   <name>.lmk      raw float32, (frames, 2, 21, 3) pixel-space landmarks,
+#                   memory-mapped on replay
+#   <name>.idx.npz  per-frame timestamp, hand count, handedness, score,
+#                   plus the source frame size
+#
+# Record:  python replay.py record take1.lmk
+# Replay:  python replay.py play take1.lmk --speed 10   (0 = as fast as possible)
+# ------------------------------------------------------------
+
+import argparse
+import os
+import time
+import numpy as np
+
+MAX_HANDS = 2
+HAND_CODES = {"Left": 0, "Right": 1}
+HAND_NAMES = ["Left", "Right"]
+
+
+def _index_path(path):
+    return os.path.splitext(path)[0] + ".idx.npz"
+
+
+class LandmarkRecorder:
+    """
+    Appends one fixed-size landmark block per frame.
+    - write(ts, labels, pts, scores, size): pts is (hands, 21, 3) or None
+    - close(): flushes data and writes the index
+    """
+    def __init__(self, path):
+        self.path = path
+        self._f = open(path, "wb")
+        self._block = np.zeros((MAX_HANDS, 21, 3), dtype=np.float32)
+        self._ts, self._n, self._hands, self._scores = [], [], [], []
+        self.size = (0, 0)
+
+    def write(self, ts, labels, pts, scores=None, size=None):
+        n = min(len(labels), MAX_HANDS)
+        self._block.fill(0)
+        if n:
+            self._block[:n] = np.asarray(pts)[:n]
+        self._f.write(self._block.tobytes())
+
+        hands = [HAND_CODES.get(l, 0) for l in labels[:n]] + [0] * (MAX_HANDS - n)
+        scores = list(scores[:n]) if scores is not None else [1.0] * n
+        self._ts.append(ts)
+        self._n.append(n)
+        self._hands.append(hands)
+        self._scores.append(scores + [0.0] * (MAX_HANDS - n))
+        if size:
+            self.size = size
+
+    def __len__(self):
+        return len(self._ts)
+
+    def close(self):
+        if self._f.closed:
+            return
+        self._f.close()
+        np.savez(_index_path(self.path),
+                 ts=np.array(self._ts, dtype=np.float64),
+                 n=np.array(self._n, dtype=np.uint8),
+                 hands=np.array(self._hands, dtype=np.uint8).reshape(-1, MAX_HANDS),
+                 scores=np.array(self._scores, dtype=np.float32).reshape(-1, MAX_HANDS),
+                 size=np.array(self.size, dtype=np.int32))
+        print(f"[Replay] Recorded {len(self)} frames -> {self.path}")
+
+
+class LandmarkReplay:
+    """
+    Reads a recording back without copying the landmark data.
+    - frames(): yields (ts, labels, pts, scores) in recorded order
+    - play(speed): same, paced to the recorded timestamps / speed
+    """
+    def __init__(self, path):
+        self.path = path
+        idx = np.load(_index_path(path))
+        self.ts = idx["ts"]
+        self.n = idx["n"]
+        self.hands = idx["hands"]
+        self.scores = idx["scores"]
+        self.size = tuple(int(v) for v in idx["size"])
+        if len(self.ts):
+            self.data = np.memmap(path, dtype=np.float32, mode="r",
+                                  shape=(len(self.ts), MAX_HANDS, 21, 3))
+        else:
+            self.data = np.zeros((0, MAX_HANDS, 21, 3), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.ts)
+
+    def duration(self):
+        return float(self.ts[-1] - self.ts[0]) if len(self.ts) > 1 else 0.0
+
+    def frames(self):
+        for i in range(len(self.ts)):
+            n = int(self.n[i])
+            labels = [HAND_NAMES[c] for c in self.hands[i, :n]]
+            yield float(self.ts[i]), labels, self.data[i, :n], self.scores[i, :n]
+
+    def play(self, speed=1.0):
+        """speed > 0 keeps recorded timing scaled by speed; 0 runs flat out."""
+        if not len(self.ts):
+            return
+        t0 = time.perf_counter()
+        ts0 = float(self.ts[0])
+        for frame in self.frames():
+            if speed > 0:
+                wait = (frame[0] - ts0) / speed - (time.perf_counter() - t0)
+                if wait > 0:
+                    time.sleep(wait)
+            yield frame
+
+
+# ------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------
+def record(path, camera=0, width=1080, height=420):
+    import cv2
+    import gestures
+
+    cap = cv2.VideoCapture(camera)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    gestures.engine.recorder = LandmarkRecorder(path)
+    print("[Replay] Recording landmarks — Ctrl+C to stop")
+    try:
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            gestures.detect(cv2.flip(frame, 1))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cap.release()
+        gestures.engine.recorder.close()
+        gestures.engine.recorder = None
+
+
+def play(path, speed=1.0):
+    import gestures
+
+    rep = LandmarkReplay(path)
+    print(f"[Replay] {len(rep)} frames, {rep.duration():.1f}s recorded, speed={speed or 'max'}")
+    t0 = time.perf_counter()
+    hands_seen = 0
+    size = rep.size if all(rep.size) else None   # same motion scaling as the recorded run
+    for ts, labels, pts, scores in rep.play(speed):
+        for r in gestures.classify_frame(labels, pts, ts=ts, scores=scores, size=size):
+            hands_seen += 1
+            print(f"{ts:.3f} {r['hand']:>5}: {r['gesture']} vol={r['volume']}")
+    elapsed = time.perf_counter() - t0
+    fps = len(rep) / elapsed if elapsed > 0 else 0.0
+    print(f"[Replay] {len(rep)} frames / {hands_seen} hands in {elapsed:.2f}s ({fps:.0f} frames/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record or replay hand landmarks")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    rec = sub.add_parser("record")
+    rec.add_argument("path")
+    rec.add_argument("--camera", type=int, default=0)
+    ply = sub.add_parser("play")
+    ply.add_argument("path")
+    ply.add_argument("--speed", type=float, default=1.0)
+    args = parser.parse_args()
+
+    if args.cmd == "record":
+        record(args.path, camera=args.camera)
+    else:
+        play(args.path, speed=args.speed)
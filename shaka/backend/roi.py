@@ -0,0 +1,108 @@
+# roi.py
+# ------------------------------------------------------------
+# Region-of-interest tracking for cheaper hand inference
+# ------------------------------------------------------------
+# After a frame with hands, the next frame is only searched inside a
+# padded box around last frame's landmarks (optionally downscaled).
+# A full-frame scan happens when tracking is lost, when a hand goes
+# missing, and every `rescan_every` frames so new hands are picked up.
+# The box stays where it is while the hands stay well inside it:
+# MediaPipe tracks landmarks from frame to frame in image-normalized
+# coordinates, so a crop that moved every frame would break that
+# tracking and force palm re-detection. It is re-centred only when a
+# hand gets within `margin` of an edge or shrinks to a small part of it.
+# ------------------------------------------------------------
+
+import numpy as np
+import cv2
+
+
+class RoiTracker:
+    """
+    - region(w, h): (x0, y0, x1, y1) to run inference on; full frame when scanning
+    - prepare(frame): (image, (x0, y0, vw, vh)) ready for inference
+    - update(pts, w, h): feed back full-frame pixel landmarks (hands, 21, >=2) or None
+    - reset(): forget the box (e.g. the frame size changed); full scan next
+    """
+    def __init__(self, pad=0.35, rescan_every=30, scale=1.0, min_size=160, margin=0.08):
+        self.pad = pad
+        self.margin = margin
+        self.rescan_every = rescan_every
+        self.scale = scale
+        self.min_size = min_size
+
+        self._box = None        # last padded box, None = full scan next
+        self._hands = 0         # hands seen on last full scan
+        self._since_scan = 0
+        self.full_scans = 0
+        self.roi_frames = 0
+        self.recentres = 0
+
+    def region(self, w, h):
+        if self._box is None or self._since_scan >= self.rescan_every:
+            return 0, 0, w, h
+        return self._box
+
+    def prepare(self, frame):
+        h, w = frame.shape[:2]
+        x0, y0, x1, y1 = self.region(w, h)
+        if (x0, y0, x1, y1) == (0, 0, w, h):
+            self.full_scans += 1
+            self._since_scan = 0
+            view = frame
+        else:
+            self.roi_frames += 1
+            self._since_scan += 1
+            view = frame[y0:y1, x0:x1]
+        if self.scale < 1.0:
+            view = cv2.resize(view, None, fx=self.scale, fy=self.scale,
+                              interpolation=cv2.INTER_AREA)
+        return view, (x0, y0, x1 - x0, y1 - y0)
+
+    def update(self, pts, w, h):
+        """pts: (hands, 21, >=2) full-frame pixel landmarks, or None when nothing was found."""
+        full = self._since_scan == 0
+        if pts is None or not len(pts):
+            self._box = None
+            return
+        if full:
+            self._hands = len(pts)
+        elif len(pts) < self._hands:
+            # a hand left the box (or the frame): look everywhere next time
+            self._box = None
+            return
+
+        xy = np.asarray(pts)[..., :2].reshape(-1, 2)
+        (lx, ly), (hx, hy) = xy.min(axis=0), xy.max(axis=0)
+        if self._keep(lx, ly, hx, hy):
+            return
+        if self._box is not None:
+            self.recentres += 1
+        bw, bh = hx - lx, hy - ly
+        px = max(bw * self.pad, (self.min_size - bw) / 2, 0)
+        py = max(bh * self.pad, (self.min_size - bh) / 2, 0)
+        x0, y0 = int(max(0, lx - px)), int(max(0, ly - py))
+        x1, y1 = int(min(w, hx + px)), int(min(h, hy + py))
+        if x1 - x0 < 8 or y1 - y0 < 8:
+            self._box = None
+        else:
+            self._box = (x0, y0, x1, y1)
+
+    def _keep(self, lx, ly, hx, hy):
+        """The current box still frames the hands: none near an edge, not lost in it."""
+        if self._box is None:
+            return False
+        x0, y0, x1, y1 = self._box
+        mx, my = (x1 - x0) * self.margin, (y1 - y0) * self.margin
+        if lx < x0 + mx or ly < y0 + my or hx > x1 - mx or hy > y1 - my:
+            return False
+        # hands moved away from the camera: a tighter box is worth one re-centre
+        return (hx - lx) * (hy - ly) * 6 >= (x1 - x0) * (y1 - y0) or \
+            (x1 - x0) * (y1 - y0) <= self.min_size * self.min_size * 1.5
+
+    def reset(self):
+        self._box = None
+
+    def stats(self):
+        return {"full_scans": self.full_scans, "roi_frames": self.roi_frames,
+                "recentres": self.recentres}
@@ -16,16 +16,89 @@ import time
 import cv2
 import threading
 import websockets
-from flask import Flask, Response
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-from gestures import detect, state   # your existing detect() + state dict
+import numpy as np
+import gestures
+from gestures import detect, classify_frame, state   # your existing detect() + state dict
+from capture import FrameGrabber
+from pipeline import BoundedQueue, Pipeline, Stage
+from stream import FrameHub
+from replay import LandmarkReplay
+from metrics import METRICS
+from roi import RoiTracker
+from keyframe import KeyframeTracker
+from idle import IdleGate
+from governor import Governor, Step
+from pacing import FramePacer
+from clients import ClientChannel, clients_stats, encode, fan_out, requested_format
+from events import GestureStream
+from engines import MAX_SOURCES, EnginePool, RingDetector, parse_sources
+from framering import FrameRing
+from overlay import OverlayRenderer
+from osc import OscOutput, parse_destinations
+from templates import TemplateIndex
+from sinks import BridgeSink, NullSink, PortSink
 
 # ------------------------------------------------------------
 # Globals
 # ------------------------------------------------------------
-CLIENTS = set()
-frame_lock = threading.Lock()
-output_frame = None
+CLIENTS = set()    # clients.ClientChannel per connected WebSocket
+hub = FrameHub()   # latest frame + shared JPEG cache for /video_feed
+overlay = OverlayRenderer()   # in-place info boxes / volume bars
+overlay_enabled = True        # the governor turns overlays off under load
+stream = GestureStream()   # per-frame delta state for WS_STREAM == "delta"
+
+TARGET_FPS = float(os.environ.get("SHAKA_TARGET_FPS", "30"))   # 0 = as fast as the hardware allows
+# work to skip on a frame after a missed deadline, e.g. "overlay,broadcast"
+SKIP_WHEN_BEHIND = set(filter(None, os.environ.get("SHAKA_SKIP_WHEN_BEHIND", "").split(",")))
+PIPELINED = os.environ.get("SHAKA_PIPELINED", "0") == "1"   # threaded stages
+REPLAY_PATH = os.environ.get("SHAKA_REPLAY")                  # landmark recording instead of camera
+REPLAY_SPEED = float(os.environ.get("SHAKA_REPLAY_SPEED", "1"))  # 0 = as fast as possible
+TRACKING = os.environ.get("SHAKA_TRACKING", "0") == "1"     # infer on crops around last hands
+INFER_SCALE = float(os.environ.get("SHAKA_INFER_SCALE", "1"))  # downscale factor for inference
+KEYFRAMES = int(os.environ.get("SHAKA_KEYFRAMES", "1"))   # run the model at most every N frames (1 = every frame)
+IDLE_AFTER = int(os.environ.get("SHAKA_IDLE_AFTER", "0"))   # empty frames before idle gating (0 = off)
+GOVERNOR = os.environ.get("SHAKA_GOVERNOR", "0") == "1"   # degrade quality when frames run over budget
+BUDGET_MS = float(os.environ.get("SHAKA_BUDGET_MS", "30"))   # per-frame processing budget for the governor
+CAPTURE_SIZE = (1080, 420)
+LOW_CAPTURE_SIZE = (720, 280)   # governor's first step down
+MIDI_SINK = os.environ.get("SHAKA_MIDI", "bridge")   # "bridge", "port" or "null"
+WS_STREAM = os.environ.get("SHAKA_WS_STREAM", "gesture")      # "gesture" per hand, or "delta" per frame
+WS_POLICY = os.environ.get("SHAKA_WS_POLICY", "drop_oldest")   # or "coalesce"
+WS_QUEUE = int(os.environ.get("SHAKA_WS_QUEUE", "32"))          # max pending messages per client
+STATS_INTERVAL = float(os.environ.get("SHAKA_STATS_INTERVAL", "0"))  # seconds between WS "stats" (0 = off)
+SOURCES = parse_sources(os.environ.get("SHAKA_SOURCES", ""))   # e.g. "0,1": one engine process per camera
+CAMERA = SOURCES[0] if SOURCES else 0
+if len(SOURCES) > MAX_SOURCES:
+    raise SystemExit(f"❌ SHAKA_SOURCES lists {len(SOURCES)} sources; at most {MAX_SOURCES} "
+                     "(each engine uses two MIDI channels)")
+SHM = os.environ.get("SHAKA_SHM", "0") == "1"   # detect in a worker process, frames via shared memory
+SHM_SLOTS = int(os.environ.get("SHAKA_SHM_SLOTS", "8"))   # frames kept in the shared ring
+OSC = parse_destinations(os.environ.get("SHAKA_OSC", ""))   # e.g. "127.0.0.1:9000,239.0.0.1:9001"
+OSC_BUNDLE = os.environ.get("SHAKA_OSC_BUNDLE", "0") == "1"   # one OSC bundle per frame
+OSC_TTL = int(os.environ.get("SHAKA_OSC_TTL", "1"))   # multicast hops
+TEMPLATES = os.environ.get("SHAKA_TEMPLATES")   # templates.py .npz of recorded poses
+
+METRICS.add_source("video", hub.stats)
+METRICS.add_source("overlay", overlay.stats)
+METRICS.add_source("ws", lambda: clients_stats(CLIENTS))
+
+osc = OscOutput(OSC, bundle=OSC_BUNDLE, ttl=OSC_TTL) if OSC else None
+if osc is not None:
+    METRICS.add_source("osc", osc.stats)
+
+if TRACKING or INFER_SCALE < 1.0:
+    gestures.engine.tracker = RoiTracker(scale=INFER_SCALE, rescan_every=30 if TRACKING else 0)
+    METRICS.add_source("roi", gestures.engine.tracker.stats)
+
+if KEYFRAMES > 1:
+    gestures.engine.keyframes = KeyframeTracker(max_interval=KEYFRAMES)
+    METRICS.add_source("keyframes", gestures.engine.keyframes.stats)
+
+if IDLE_AFTER > 0:
+    gestures.engine.idle = IdleGate(after=IDLE_AFTER)
+    METRICS.add_source("idle", gestures.engine.idle.stats)
 
 # ------------------------------------------------------------
 # Flask setup (video stream)
@@ -35,156 +108,428 @@ CORS(app)
 
 @app.route("/video_feed")
 def video_feed():
-    """Continuously stream MJPEG frames to the web UI."""
-    def generate():
-        global output_frame
-        while True:
-            with frame_lock:
-                if output_frame is None:
-                    continue
-                ok, jpeg = cv2.imencode(".jpg", output_frame)
-                if not ok:
-                    continue
-                frame_bytes = jpeg.tobytes()
-            yield (
-                b"--frame\r\n"
-                b"Content-Type: image/jpeg\r\n\r\n" + frame_bytes + b"\r\n"
-            )
-    return Response(generate(),
+    """
+    Continuously stream MJPEG frames to the web UI.
+    Optional query params: ?fps=10&quality=60 (per viewer).
+    """
+    fps = request.args.get("fps", type=float)
+    quality = request.args.get("quality", type=int)
+    if quality is not None:
+        quality = max(10, min(100, quality))
+    return Response(hub.stream(fps=fps, quality=quality),
                     mimetype="multipart/x-mixed-replace; boundary=frame")
 
+@app.route("/metrics")
+def metrics():
+    """Latency histograms (ms), FPS meters, counters and stage stats as JSON."""
+    return jsonify(METRICS.snapshot())
+
 def start_flask():
     app.run(host="0.0.0.0", port=5000, debug=False, use_reloader=False)
 
 # ------------------------------------------------------------
 # WebSocket setup
 # ------------------------------------------------------------
-async def broadcast(msg: dict):
-    """Send JSON to all connected clients."""
+async def broadcast(msg: dict, t_capture: float = None):
+    """Queue a message for every connected client (never waits on a socket)."""
     if not CLIENTS:
         return
-    data = json.dumps(msg)
-    await asyncio.gather(*[c.send(data) for c in list(CLIENTS)],
-                         return_exceptions=True)
+    fan_out(CLIENTS, msg, t_capture)
+
+async def publish_results(results, t_capture: float = None, session=None):
+    """Broadcast one frame's detect() results in the configured stream mode."""
+    if osc is not None:
+        osc.send_results(results, session, t_capture)
+        METRICS.since("capture_to_osc", t_capture)
+    if WS_STREAM == "delta":
+        msg = stream.update(results, t_capture, scope=session)
+        if msg is not None:
+            await broadcast(msg, t_capture)
+    else:
+        for r in results:
+            await broadcast(gesture_message(r), t_capture)
 
 async def ws_handler(ws):
+    delta = WS_STREAM == "delta"
+    ch = ClientChannel(ws, fmt=requested_format(ws), policy=WS_POLICY, maxsize=WS_QUEUE,
+                       snapshot_fn=stream.snapshot if delta else None)
     try:
-        CLIENTS.add(ws)
-        await ws.send(json.dumps({"type": "connected"}))
-        async for _ in ws:
-            pass
+        CLIENTS.add(ch)
+        ch.start()
+        ch.push(json.dumps({"type": "connected", "format": ch.fmt, "stream": WS_STREAM}))
+        if delta:
+            ch.push(encode(stream.snapshot(), ch.fmt))   # same wire format as the deltas
+        async for raw in ws:
+            ch.handle(raw)
     except Exception as e:
         print(f"⚠️ WebSocket connection error: {e}")
     finally:
-        CLIENTS.discard(ws)
+        CLIENTS.discard(ch)
+        ch.close()
+
+async def stats_loop(interval=None):
+    """Periodically push a metrics snapshot to every client as a "stats" message."""
+    interval = interval or STATS_INTERVAL
+    while True:
+        await asyncio.sleep(interval)
+        await broadcast({"type": "stats", **METRICS.snapshot()})
 
 async def ws_server():
     async with websockets.serve(ws_handler, "localhost", 8765):
         print("✅ WebSocket server running at ws://localhost:8765")
         await asyncio.Future()
 
+# ------------------------------------------------------------
+# Overlay + message helpers
+# ------------------------------------------------------------
+def gesture_message(r: dict) -> dict:
+    """WebSocket payload for one detect() result."""
+    msg = {
+        "type": "gesture",
+        "hand": r.get("hand", "Unknown"),
+        "gesture": r.get("gesture", "None"),
+        "volume": r.get("volume", 0),
+        "fingers": r.get("fingers", 0),
+        "ts": r.get("ts", time.time())
+    }
+    if "session" in r:
+        msg["session"] = r["session"]
+    return msg
+
+def draw_overlay(frame, results, swipes=state):
+    """Draw per-hand info boxes + volume bars into frame (in place); returns it."""
+    return overlay.draw(frame, results, swipes)
+
+def watched():
+    """Someone is on /video_feed; otherwise landmarks and overlays aren't drawn at all."""
+    return hub.viewers > 0
+
+def set_overlay(on):
+    global overlay_enabled
+    overlay_enabled = on
+
+def publish_frame(frame):
+    # frames are never touched after this point, so no copy is needed
+    hub.publish(frame)
+
+# ------------------------------------------------------------
+# CPU-budget governor (camera_loop / pipelined_loop)
+# ------------------------------------------------------------
+def make_governor(grabber):
+    """Quality ladder, in the order it is given up when frames run over BUDGET_MS."""
+    engine = gestures.engine
+    complexity = engine.hands_options.get("model_complexity", 1)
+    max_hands = engine.hands_options.get("max_num_hands", 2)
+    loop = asyncio.get_running_loop()
+    governor = Governor([
+        Step("resolution", lambda: grabber.resize(*LOW_CAPTURE_SIZE),
+             lambda: grabber.resize(*CAPTURE_SIZE)),
+        Step("model_complexity", lambda: engine.set_hands_options(model_complexity=0),
+             lambda: engine.set_hands_options(model_complexity=complexity)),
+        Step("max_num_hands", lambda: engine.set_hands_options(max_num_hands=1),
+             lambda: engine.set_hands_options(max_num_hands=max_hands)),
+        Step("overlay", lambda: set_overlay(False), lambda: set_overlay(True)),
+        Step("jpeg_quality", lambda: setattr(hub, "quality_cap", 60),
+             lambda: setattr(hub, "quality_cap", None)),
+    ], budget=BUDGET_MS / 1000)
+
+    @governor.on_change
+    def report(event):
+        print(f"⚙️ Governor {event['action']} {event['step']} "
+              f"(level {event['level']}, {event['frame_ms']} ms / {event['budget_ms']} ms)")
+        METRICS.incr(f"governor_{event['action']}")
+        # may run on the inference thread; client queues belong to the event loop
+        loop.call_soon_threadsafe(fan_out, CLIENTS, event, None)
+
+    METRICS.add_source("governor", governor.stats)
+    return governor
+
 # ------------------------------------------------------------
 # Camera + Gesture Detection Loop
 # ------------------------------------------------------------
 async def camera_loop():
-    global output_frame
-    cap = cv2.VideoCapture(0)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1080)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 420)
+    # capture runs on its own thread; we only ever see the newest frame
+    grabber = FrameGrabber(CAMERA, width=CAPTURE_SIZE[0], height=CAPTURE_SIZE[1]).start()
+    METRICS.add_source("capture", grabber.stats)
+    pacer = FramePacer(TARGET_FPS)
+    METRICS.add_source("pacer", pacer.stats)
+    governor = make_governor(grabber) if GOVERNOR else None
 
     print("🎥 Camera stream active — resilient dual-hand overlay")
+    last_report = time.time()
 
     while True:
-        ok, frame = cap.read()
-        if not ok or frame is None:
-            print("⚠️ Camera frame skipped")
-            await asyncio.sleep(0.05)
+        if time.time() - last_report > 10:
+            print(f"🎥 Capture stats: {grabber.stats()}")
+            last_report = time.time()
+
+        frame, t_capture = grabber.read()
+        if frame is None:
+            await asyncio.sleep(0.005)
             continue
 
+        pacer.begin()
+        t0 = time.perf_counter()
         frame = cv2.flip(frame, 1)
+        show = watched()
+        draw = show and overlay_enabled
 
         try:
-            results = detect(frame)
+            results = detect(frame, t_capture=t_capture, draw=draw)
         except Exception as e:
             print(f"⚠️ Detect error: {e}")
             results = []
 
+        # when the last frame ran late, shed the optional work
+        behind = pacer.behind
+        if behind:
+            METRICS.incr("frames_behind")
+
         # broadcast gesture events
-        for r in results:
-            await broadcast({
-                "type": "gesture",
-                "hand": r.get("hand", "Unknown"),
-                "gesture": r.get("gesture", "None"),
-                "volume": r.get("volume", 0),
-                "fingers": r.get("fingers", 0),
-                "ts": r.get("ts", time.time())
-            })
-
-        # Draw overlays for both hands
-        h, w, _ = frame.shape
-        left_x = 150
-        right_x = w // 2 + 200
-        y_base = 150
-
-        if results:
-            for r in results:
-                hand = r.get("hand", "Unknown")
-                x_pos = left_x if hand == "Left" else right_x
-                y = y_base
-
-                # translucent box
-                overlay = frame.copy()
-                cv2.rectangle(overlay, (x_pos - 20, y - 40),
-                              (x_pos + 450, y + 130), (0, 0, 0), -1)
-                frame = cv2.addWeighted(overlay, 0.4, frame, 0.6, 0)
-
-                # text + bars
-                gesture_text = r.get("gesture", "None")
-                fingers = r.get("fingers", 0)
-                vol = r.get("volume", 0)
-
-                cv2.putText(frame, f"{hand}: {gesture_text}",
-                            (x_pos, y),
-                            cv2.FONT_HERSHEY_DUPLEX, 1.0, (255, 0, 255), 2)
-                cv2.putText(frame, f"Fingers: {fingers}  |  Vol: {vol}",
-                            (x_pos, y + 50),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
-
-                # volume bar
-                bar_x = x_pos
-                bar_y = h - 150
-                vol_height = int((vol / 100) * 300)
-                cv2.rectangle(frame, (bar_x, bar_y - vol_height),
-                              (bar_x + 60, bar_y), (0, 255, 0), -1)
-                cv2.rectangle(frame, (bar_x, bar_y - 300),
-                              (bar_x + 60, bar_y), (255, 255, 255), 3)
-
-                # wave info
-                wave_info = state.get(hand, {}).get("last_wave", {})
-                if time.time() - wave_info.get("time", 0) < 1.5:
-                    cv2.putText(frame, wave_info.get("text", ""),
-                                (x_pos, bar_y - 350),
-                                cv2.FONT_HERSHEY_DUPLEX, 1.1, (0, 255, 255), 3)
-        else:
-            # show fallback when no hands detected
-            cv2.putText(frame, "No hands detected",
-                        (int(w / 2) - 200, int(h / 2)),
-                        cv2.FONT_HERSHEY_DUPLEX, 1.2, (0, 0, 255), 3)
-
-        # push frame to stream (always!)
-        with frame_lock:
-            output_frame = frame.copy()
-
-        await asyncio.sleep(0.05)
-
-    cap.release()
+        if not (behind and "broadcast" in SKIP_WHEN_BEHIND):
+            await publish_results(results, t_capture)
+        METRICS.tick("frames")
+
+        # Draw overlays for both hands, then push frame to stream
+        if show and not (behind and "overlay" in SKIP_WHEN_BEHIND):
+            if draw:
+                frame = draw_overlay(frame, results)
+            publish_frame(frame)
+
+        if governor is not None:
+            governor.observe(time.perf_counter() - t0)
+        await pacer.wait()
+
+    grabber.stop()
+    print(f"🎥 Camera stopped — {grabber.stats()}")
+
+# ------------------------------------------------------------
+# Pipelined mode: capture | inference | overlay on worker threads
+# ------------------------------------------------------------
+async def pipelined_loop():
+    """
+    Same outputs as camera_loop, but detect() and overlay drawing run on
+    their own threads so frame N+1 is inferred while frame N is drawn.
+    The event loop only does WebSocket fan-out.
+    """
+    loop = asyncio.get_running_loop()
+    grabber = FrameGrabber(CAMERA, width=CAPTURE_SIZE[0], height=CAPTURE_SIZE[1]).start()
+    METRICS.add_source("capture", grabber.stats)
+    render_q = BoundedQueue(maxsize=2)
+    governor = make_governor(grabber) if GOVERNOR else None
+
+    def next_frame(timeout):
+        frame, ts = grabber.wait(timeout)
+        return None if frame is None else (frame, ts)
+
+    def infer(item):
+        frame, t_capture = item
+        t0 = time.perf_counter()
+        frame = cv2.flip(frame, 1)
+        show = watched()
+        draw = show and overlay_enabled
+        try:
+            results = detect(frame, t_capture=t_capture, draw=draw)
+        except Exception as e:
+            print(f"⚠️ Detect error: {e}")
+            results = []
+        # fan-out as soon as results exist, before the overlay is drawn
+        asyncio.run_coroutine_threadsafe(publish_results(results, t_capture), loop)
+        METRICS.tick("frames")
+        if governor is not None:
+            governor.observe(time.perf_counter() - t0)
+        return (frame, results, draw) if show else None
+
+    def render(item):
+        frame, results, draw = item
+        publish_frame(draw_overlay(frame, results) if draw else frame)
+
+    pacer = FramePacer(TARGET_FPS)
+    METRICS.add_source("pacer", pacer.stats)
+    pipeline = Pipeline(
+        Stage("inference", infer, next_frame, outbox=render_q, pacer=pacer),
+        Stage("overlay", render, render_q.get),
+    ).start()
+    METRICS.add_source("pipeline", pipeline.stats)
+
+    print("🎥 Camera stream active — pipelined (inference | overlay)")
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(f"🎥 Capture stats: {grabber.stats()}")
+            print(f"🧵 Pipeline stats: {pipeline.stats()}")
+    finally:
+        pipeline.stop()
+        grabber.stop()
+
+# ------------------------------------------------------------
+# Shared-memory mode: capture here, detect in a worker process
+# ------------------------------------------------------------
+async def shm_loop():
+    """
+    Capture writes each (mirrored) frame once into a framering.FrameRing; a
+    detect worker process reads the slot in place and sends its results back
+    over a small queue. /video_feed is served from the same slots.
+    """
+    loop = asyncio.get_running_loop()
+    grabber = FrameGrabber(CAMERA, width=CAPTURE_SIZE[0], height=CAPTURE_SIZE[1]).start()
+    METRICS.add_source("capture", grabber.stats)
+    frame, _ = await asyncio.to_thread(grabber.wait, 10.0)
+    if frame is None:
+        print("⚠️ No camera frames — shared-memory mode not started")
+        grabber.stop()
+        return
+    ring = FrameRing(frame.shape, slots=SHM_SLOTS)
+    detector = RingDetector(ring, gestures.get_sink(), keyframes=KEYFRAMES,
+                            idle_after=IDLE_AFTER, templates=template_spec).start()
+    METRICS.add_source("detector", detector.stats)
+    pacer = FramePacer(TARGET_FPS)
+    METRICS.add_source("pacer", pacer.stats)
+
+    def write():
+        while detector.running:
+            frame, t_capture = grabber.wait(0.5)
+            if frame is None:
+                continue
+            pacer.begin()
+            ring.write(frame, t_capture, flip=True)
+            detector.submit()
+            pacer.wait_sync()
+
+    def pump():
+        while detector.running:
+            item = detector.poll(0.5)
+            if item is None:
+                continue
+            _, results, t_capture, seq = item
+            asyncio.run_coroutine_threadsafe(publish_results(results, t_capture), loop)
+            METRICS.tick("frames")
+            show = watched()
+            detector.draw = show
+            if show:
+                view = ring.view(seq)
+                if view is not None:
+                    # swipe state lives in the worker, so no swipe banner here
+                    hub.publish(draw_overlay(view, results, None), check=lambda: ring.valid(seq))
+
+    threading.Thread(target=write, name="shm-writer", daemon=True).start()
+    threading.Thread(target=pump, name="shm-pump", daemon=True).start()
+    print(f"🎥 Camera stream active — detect process on shared memory ({ring.slots} slots)")
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(f"🎥 Capture stats: {grabber.stats()}")
+            print(f"🧵 Detector stats: {detector.stats()}")
+    finally:
+        detector.stop()
+        grabber.stop()
+        ring.close()
+
+# ------------------------------------------------------------
+# Replay source: recorded landmarks instead of the camera
+# ------------------------------------------------------------
+async def replay_loop(path=None, speed=None):
+    """Feed a replay.py recording through classification, MIDI, WebSocket and the video feed."""
+    loop = asyncio.get_running_loop()
+    rep = LandmarkReplay(path or REPLAY_PATH)
+    speed = REPLAY_SPEED if speed is None else speed
+    w, h = rep.size if all(rep.size) else (1080, 420)
+
+    def run():
+        t0 = time.perf_counter()
+        for ts, labels, pts, scores in rep.play(speed):
+            results = classify_frame(labels, pts, ts=ts, scores=scores, size=(w, h))
+            asyncio.run_coroutine_threadsafe(publish_results(results), loop)
+            if watched():
+                publish_frame(draw_overlay(np.zeros((h, w, 3), dtype=np.uint8), results))
+        return time.perf_counter() - t0
+
+    print(f"📼 Replaying {len(rep)} frames from {rep.path} (speed={speed or 'max'})")
+    elapsed = await asyncio.to_thread(run)
+    print(f"📼 Replay finished in {elapsed:.2f}s")
+
+# ------------------------------------------------------------
+# Multi-performer mode: one GestureEngine process per source
+# ------------------------------------------------------------
+async def multi_loop(sources=None):
+    """
+    Each source gets its own worker process (engines.EnginePool); their results
+    are merged into the shared WebSocket stream tagged with "session", and their
+    MIDI goes out through the shared sink on per-session channels.
+    Workers don't ship frames back, so /video_feed stays empty in this mode.
+    """
+    loop = asyncio.get_running_loop()
+    pool = EnginePool(sources or SOURCES, gestures.get_sink(), target_fps=TARGET_FPS,
+                      keyframes=KEYFRAMES, idle_after=IDLE_AFTER, templates=template_spec).start()
+    METRICS.add_source("engines", pool.stats)
+
+    def pump():
+        while pool.running:
+            item = pool.poll(0.5)
+            if item is None:
+                continue
+            session, results, t_capture = item[:3]
+            asyncio.run_coroutine_threadsafe(publish_results(results, t_capture, session), loop)
+            METRICS.tick("frames")
+
+    threading.Thread(target=pump, name="engine-pump", daemon=True).start()
+    print(f"🎥 {len(pool.sources)} engines running: {pool.sources}")
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(f"🧵 Engine stats: {pool.stats()}")
+    finally:
+        pool.stop()
 
 # ------------------------------------------------------------
 # Entry Point
 # ------------------------------------------------------------
+def make_sink(kind=None):
+    kind = kind or MIDI_SINK
+    if kind == "null":
+        return NullSink()
+    if kind == "port":
+        return PortSink()
+    sink = BridgeSink()
+    METRICS.add_source("midi", sink.bridge.stats)
+    return sink
+
+template_spec = None   # (path, notes) for engine processes, set by load_templates()
+
+def load_templates(sink, path=None):
+    """Recorded pose templates on the default engine; through the Bridge, names drive its note_map."""
+    global template_spec
+    path = path or TEMPLATES
+    index = TemplateIndex.load(path)
+    notes = dict(index.notes)
+    if isinstance(sink, BridgeSink):
+        notes = sink.bridge.map_templates(index.names, notes,
+                                          reserved=set(gestures.NOTE_MAP) | set(gestures.CC_MAP))
+    gestures.set_templates(index, notes)
+    template_spec = (path, notes)
+    print(f"🖐️ {len(index.names)} pose templates ({len(index)} samples) from {path}")
+
 async def main():
+    sink = gestures.set_sink(make_sink())
+    if TEMPLATES:
+        load_templates(sink)
+    multi = len(SOURCES) > 1 and not REPLAY_PATH
+    if not (REPLAY_PATH or multi or SHM):
+        # load the model now so the first camera frame doesn't pay for it
+        print(f"🧠 Hand model ready in {await asyncio.to_thread(gestures.warm_up):.2f}s")
     threading.Thread(target=start_flask, daemon=True).start()
-    await asyncio.gather(ws_server(), camera_loop())
+    if REPLAY_PATH:
+        loop_fn = replay_loop
+    elif multi:
+        loop_fn = multi_loop
+    elif SHM:
+        loop_fn = shm_loop
+    else:
+        loop_fn = pipelined_loop if PIPELINED else camera_loop
+    tasks = [ws_server(), loop_fn()]
+    if STATS_INTERVAL > 0:
+        tasks.append(stats_loop())
+    await asyncio.gather(*tasks)
 
 if __name__ == "__main__":
     asyncio.run(main())
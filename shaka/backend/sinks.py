@@ -0,0 +1,101 @@
+# sinks.py
+# ------------------------------------------------------------
+# Pluggable MIDI output sinks for gestures.py
+# ------------------------------------------------------------
+# Every sink takes ready-made mido Messages:
+#   send(msg, t_capture)   deliver (or drop / record) one message; t_capture
+#                          is the frame's capture time, and capture_to_midi
+#                          is recorded once the message actually leaves
+#   close()                release whatever the sink holds
+#
+#   PortSink       opens a mido output port lazily, on first send
+#   BridgeSink     forwards to io_bridge.Bridge (scheduler thread, CC coalescing)
+#   NullSink       drops everything (headless runs, benchmarks)
+#   RecordingSink  keeps (time, msg) pairs in memory (tests, tools)
+# ------------------------------------------------------------
+
+import time
+from collections import deque
+from metrics import METRICS
+
+
+class MidiSink:
+    """Base class / interface for MIDI outputs."""
+    def send(self, msg, t_capture=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class NullSink(MidiSink):
+    def __init__(self):
+        self.count = 0
+
+    def send(self, msg, t_capture=None):
+        self.count += 1
+        METRICS.since("capture_to_midi", t_capture)
+
+
+class RecordingSink(MidiSink):
+    def __init__(self, maxlen=10000):
+        self.messages = deque(maxlen=maxlen)
+
+    def send(self, msg, t_capture=None):
+        self.messages.append((time.time(), msg))
+        METRICS.since("capture_to_midi", t_capture)
+
+    def clear(self):
+        self.messages.clear()
+
+
+class PortSink(MidiSink):
+    """
+    First mido output port among `names` that opens, opened on first use.
+    If none can be opened a warning is printed once and messages are dropped.
+    """
+    def __init__(self, names=("shaka 1", "shaka")):
+        self.names = names
+        self.port = None
+        self._failed = False
+
+    def open(self):
+        if self.port is not None or self._failed:
+            return self.port
+        import mido
+        for name in self.names:
+            try:
+                self.port = mido.open_output(name)
+                print(f"[MIDI] Connected to MIDI port: {name}")
+                return self.port
+            except Exception as e:
+                err = e
+        self._failed = True
+        print(f"[MIDI] No MIDI port among {list(self.names)} ({err}); MIDI output disabled")
+        return None
+
+    def send(self, msg, t_capture=None):
+        port = self.port or self.open()
+        if port is not None:
+            port.send(msg)
+            METRICS.since("capture_to_midi", t_capture)
+
+    def close(self):
+        if self.port is not None:
+            self.port.close()
+            self.port = None
+
+
+class BridgeSink(MidiSink):
+    """Route through io_bridge.Bridge (and its MidiScheduler)."""
+    def __init__(self, bridge=None):
+        if bridge is None:
+            from io_bridge import Bridge
+            bridge = Bridge()
+        self.bridge = bridge
+
+    def send(self, msg, t_capture=None):
+        self.bridge.send_message(msg, t_capture)
+
+    def close(self):
+        self.bridge.close()
@@ -0,0 +1,114 @@
+# stream.py
+# ------------------------------------------------------------
+# Shared MJPEG frame hub for /video_feed
+# ------------------------------------------------------------
+# The camera loop publishes raw frames; each new frame gets a version
+# number. A frame is JPEG-encoded at most once per quality setting, by
+# whichever viewer asks first, and every other viewer reuses the bytes.
+# Viewers sleep on a condition until the next version arrives.
+# ------------------------------------------------------------
+
+import threading
+import time
+import cv2
+
+DEFAULT_QUALITY = 95   # cv2.imencode default
+BOUNDARY = b"--frame\r\nContent-Type: image/jpeg\r\n\r\n"
+
+
+class FrameHub:
+    """
+    Latest-frame cache shared by all MJPEG viewers.
+    - publish(frame, check): store newest frame (no copy, no encode); `check()`
+      is asked after encoding whether the frame was still intact (shared-memory slots)
+    - jpeg(quality): (version, bytes) for the current frame, encoded once
+    - stream(fps, quality): multipart generator for one viewer
+    - quality_cap: optional upper bound on every viewer's JPEG quality
+    """
+    def __init__(self, default_quality=DEFAULT_QUALITY):
+        self.default_quality = default_quality
+        self.quality_cap = None
+        self._cond = threading.Condition()
+        self._encode_lock = threading.Lock()
+        self._frame = None
+        self._check = None
+        self._cache = {}   # quality -> jpeg bytes for the current version
+        self.version = 0
+        self.viewers = 0
+        self.encodes = 0
+        self.torn = 0
+
+    def publish(self, frame, check=None):
+        """Hand over a frame. The caller must not modify it afterwards."""
+        with self._cond:
+            self._frame = frame
+            self._check = check
+            self._cache = {}
+            self.version += 1
+            self._cond.notify_all()
+
+    def wait_for(self, last_version, timeout=1.0):
+        """Block until version > last_version; returns the new version or None."""
+        with self._cond:
+            if self._cond.wait_for(lambda: self.version > last_version, timeout):
+                return self.version
+            return None
+
+    def jpeg(self, quality=None):
+        quality = quality or self.default_quality
+        if self.quality_cap:
+            quality = min(quality, self.quality_cap)
+        with self._cond:
+            frame, version, check = self._frame, self.version, self._check
+            data = self._cache.get(quality)
+        if frame is None:
+            return version, None
+        if data is not None:
+            return version, data
+
+        # one encoder at a time; whoever waited behind it reuses the result
+        with self._encode_lock:
+            with self._cond:
+                if self.version == version and quality in self._cache:
+                    return version, self._cache[quality]
+            ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, int(quality)])
+            if not ok:
+                return version, None
+            if check is not None and not check():
+                self.torn += 1   # the slot was reused while we encoded it
+                return version, None
+            data = jpeg.tobytes()
+            self.encodes += 1
+            with self._cond:
+                if self.version == version:
+                    self._cache[quality] = data
+        return version, data
+
+    def stream(self, fps=None, quality=None):
+        """Yield multipart MJPEG chunks, at most `fps` per second if given."""
+        min_gap = 1.0 / fps if fps else 0.0
+        with self._cond:
+            self.viewers += 1
+        try:
+            seen = 0
+            last_sent = 0.0
+            while True:
+                version = self.wait_for(seen)
+                if version is None:
+                    continue
+                if min_gap:
+                    rest = min_gap - (time.monotonic() - last_sent)
+                    if rest > 0:
+                        time.sleep(rest)
+                seen, data = self.jpeg(quality)
+                if data is None:
+                    continue
+                last_sent = time.monotonic()
+                yield BOUNDARY + data + b"\r\n"
+        finally:
+            with self._cond:
+                self.viewers -= 1
+
+    def stats(self):
+        return {"version": self.version, "viewers": self.viewers, "encodes": self.encodes,
+                "torn": self.torn}
@@ -0,0 +1,271 @@
+# templates.py
+# ------------------------------------------------------------
+# Template-based pose recognition
+# ------------------------------------------------------------
+# Every hand is normalized before it is compared:
+#   - wrist at the origin
+#   - rotated so wrist -> middle-finger knuckle points straight up
+#   - Left hands mirrored, so one template serves both hands
+#   - flattened (x, y) and scaled to unit length
+# (MediaPipe's z is in different units from the pixel x/y, so it is
+# left out.) Recorded samples are stacked into one (samples, 42) matrix.
+# Every hand of a frame is matched against all of them with a single
+# matrix product; the nearest sample names the pose. Distances on unit
+# vectors go 0 (identical) .. 2. Every name gets its own cutoff from
+# the spread of its samples (SPREAD x their 95th-percentile distance
+# from the name's mean pose, kept within MIN_DIST..max_dist), so a
+# tight template only claims hands that really look like it; anything
+# past the cutoff counts as "no template" and the rule-based gestures
+# still apply.
+#
+# A template file is one compressed .npz: vectors (float32), a name id
+# per row, the names, the cutoffs and max_dist, plus optional MIDI
+# notes per name.
+#
+# Record: python templates.py record dj.npz PLAY_A --frames 40 [--note 70] [--max-dist 0.3]
+# From a replay.py take: python templates.py add dj.npz SCRATCH take1.lmk
+# Inspect: python templates.py list dj.npz
+# ------------------------------------------------------------
+
+import argparse
+import os
+import time
+import numpy as np
+
+WRIST, MIDDLE_MCP = 0, 9
+DIM = 42            # 21 landmarks x (x, y)
+MAX_DIST = 0.35     # widest cutoff any template gets, on unit vectors
+MIN_DIST = 0.08     # narrowest cutoff (templates recorded from a perfectly still hand)
+SPREAD = 2.0        # cutoff = SPREAD x 95th-percentile sample distance from the mean pose
+
+
+def normalize(pts, labels):
+    """(hands, 21, >=2) pixel landmarks + handedness -> (hands, 42) unit pose vectors."""
+    xy = np.asarray(pts, dtype=np.float64)[:, :, :2]
+    xy = xy - xy[:, WRIST:WRIST + 1]
+    left = np.array([l == "Left" for l in labels], dtype=bool)
+    xy[left, :, 0] *= -1.0
+    # rotate each hand so its wrist -> middle knuckle axis lands on -y (image up)
+    axis = xy[:, MIDDLE_MCP]
+    angle = np.arctan2(axis[:, 0], -axis[:, 1])
+    c, s = np.cos(angle)[:, None], np.sin(angle)[:, None]
+    x, y = xy[..., 0], xy[..., 1]
+    rot = np.stack([c * x + s * y, -s * x + c * y], axis=-1).reshape(len(xy), DIM)
+    norm = np.linalg.norm(rot, axis=1, keepdims=True)
+    return (rot / np.maximum(norm, 1e-9)).astype(np.float32)
+
+
+class TemplateIndex:
+    """
+    Recorded pose samples, matched all at once.
+    - add(name, pts, labels): append normalized samples for one pose
+    - match(pts, labels): (names, dists) per hand; name None beyond that name's cutoff
+    - cutoffs: per-name acceptance distance, calibrated from the samples, capped by max_dist
+    - save(path) / TemplateIndex.load(path): compact .npz
+    - notes: optional template name -> MIDI note
+    """
+    def __init__(self, max_dist=MAX_DIST):
+        self.max_dist = max_dist
+        self.names = []
+        self.notes = {}
+        self.vectors = np.zeros((0, DIM), dtype=np.float32)
+        self.ids = np.zeros(0, dtype=np.int32)
+        self.cutoffs = np.zeros(0, dtype=np.float32)
+        self._names = np.array([], dtype=object)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, name, pts, labels, note=None):
+        if name not in self.names:
+            self.names.append(name)
+            self._names = np.array(self.names, dtype=object)
+        if note is not None:
+            self.notes[name] = int(note)
+        vec = normalize(pts, labels)
+        self.vectors = np.concatenate([self.vectors, vec])
+        self.ids = np.concatenate([self.ids, np.full(len(vec), self.names.index(name), dtype=np.int32)])
+        self.calibrate()
+        return len(vec)
+
+    def calibrate(self):
+        """Per-name cutoffs from how far each name's samples stray from its mean pose."""
+        cutoffs = np.full(len(self.names), MIN_DIST, dtype=np.float32)
+        for i in range(len(self.names)):
+            vec = self.vectors[self.ids == i]
+            if len(vec) > 1:
+                mean = vec.mean(axis=0)
+                mean /= max(np.linalg.norm(mean), 1e-9)
+                spread = np.percentile(np.linalg.norm(vec - mean, axis=1), 95)
+                cutoffs[i] = SPREAD * spread
+        self.cutoffs = np.clip(cutoffs, MIN_DIST, max(self.max_dist, MIN_DIST))
+
+    def remove(self, name):
+        if name not in self.names:
+            return 0
+        gone = self.names.index(name)
+        keep = self.ids != gone
+        removed = int((~keep).sum())
+        self.vectors, self.ids = self.vectors[keep], self.ids[keep]
+        self.ids[self.ids > gone] -= 1
+        self.names.pop(gone)
+        self.notes.pop(name, None)
+        self._names = np.array(self.names, dtype=object)
+        self.calibrate()
+        return removed
+
+    def match(self, pts, labels):
+        if not len(self.ids) or not len(labels):
+            return [None] * len(labels), np.full(len(labels), np.inf)
+        x = normalize(pts, labels)
+        # unit vectors: |x - v|^2 = 2 - 2 x.v, so nearest = largest dot product
+        sim = x @ self.vectors.T
+        best = sim.argmax(axis=1)
+        dists = np.sqrt(np.maximum(2.0 - 2.0 * sim[np.arange(len(x)), best], 0.0))
+        ids = self.ids[best]
+        names = self._names[ids]
+        return [n if d <= c else None for n, d, c in zip(names, dists, self.cutoffs[ids])], dists
+
+    def counts(self):
+        return {n: int((self.ids == i).sum()) for i, n in enumerate(self.names)}
+
+    def save(self, path):
+        np.savez_compressed(path, vectors=self.vectors, ids=self.ids,
+                            names=np.array(self.names, dtype=str),
+                            note_names=np.array(list(self.notes), dtype=str),
+                            note_values=np.array(list(self.notes.values()), dtype=np.int16),
+                            cutoffs=self.cutoffs, max_dist=np.float32(self.max_dist))
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        index = cls(max_dist=float(data["max_dist"]))
+        index.names = [str(n) for n in data["names"]]
+        index._names = np.array(index.names, dtype=object)
+        index.vectors = data["vectors"].astype(np.float32)
+        index.ids = data["ids"].astype(np.int32)
+        index.notes = {str(n): int(v) for n, v in zip(data["note_names"], data["note_values"])}
+        if "cutoffs" in data.files:
+            index.cutoffs = data["cutoffs"].astype(np.float32)
+        else:
+            index.calibrate()   # files saved before per-name cutoffs
+        return index
+
+
+class TemplateRecorder:
+    """
+    Stands in for GestureEngine.recorder: detected hands become samples of `name`.
+    Collects up to `frames` samples of the first hand (or only of `hand`).
+    """
+    def __init__(self, index, name, frames=40, hand=None, note=None):
+        self.index = index
+        self.name = name
+        self.frames = frames
+        self.hand = hand
+        self.note = note
+        self.taken = 0
+
+    @property
+    def full(self):
+        return self.taken >= self.frames
+
+    def write(self, ts, labels, pts, scores=None, size=None):
+        if self.full or not len(labels):
+            return
+        i = labels.index(self.hand) if self.hand in labels else (0 if self.hand is None else None)
+        if i is None:
+            return
+        self.taken += self.index.add(self.name, np.asarray(pts)[i:i + 1], [labels[i]], note=self.note)
+
+    def close(self):
+        pass
+
+
+# ------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------
+def open_index(path, max_dist=None):
+    index = TemplateIndex.load(path) if os.path.exists(path) else TemplateIndex()
+    if max_dist is not None:
+        index.max_dist = max_dist
+        index.calibrate()
+    return index
+
+
+def record(path, name, frames=40, camera=0, hand=None, note=None, max_dist=None, delay=2.0,
+           width=1080, height=420):
+    import cv2
+    import gestures
+
+    index = open_index(path, max_dist)
+    index.remove(name)   # re-recording replaces the old samples
+    cap = cv2.VideoCapture(camera)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    recorder = TemplateRecorder(index, name, frames=frames, hand=hand, note=note)
+    print(f"[Templates] Hold '{name}' — recording {frames} samples in {delay:.0f}s")
+    t_start = time.time() + delay
+    try:
+        while not recorder.full:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            gestures.engine.recorder = recorder if time.time() >= t_start else None
+            gestures.detect(cv2.flip(frame, 1), draw=False)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cap.release()
+        gestures.engine.recorder = None
+    index.save(path)
+    print(f"[Templates] {recorder.taken} samples of '{name}' -> {path}")
+
+
+def add_recording(path, name, take, hand=None, note=None, max_dist=None, every=3):
+    from replay import LandmarkReplay
+
+    index = open_index(path, max_dist)
+    recorder = TemplateRecorder(index, name, frames=np.inf, hand=hand, note=note)
+    for i, (ts, labels, pts, _) in enumerate(LandmarkReplay(take).frames()):
+        if i % every == 0:
+            recorder.write(ts, labels, pts)
+    index.save(path)
+    print(f"[Templates] {recorder.taken} samples of '{name}' from {take} -> {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record and inspect pose templates")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    rec = sub.add_parser("record")
+    rec.add_argument("path")
+    rec.add_argument("name")
+    rec.add_argument("--frames", type=int, default=40)
+    rec.add_argument("--camera", type=int, default=0)
+    rec.add_argument("--hand", choices=["Left", "Right"])
+    rec.add_argument("--note", type=int, help="MIDI note fired when the pose is held")
+    rec.add_argument("--max-dist", type=float, help=f"widest per-template cutoff (default {MAX_DIST})")
+    add = sub.add_parser("add")
+    add.add_argument("path")
+    add.add_argument("name")
+    add.add_argument("take", help="replay.py .lmk recording")
+    add.add_argument("--hand", choices=["Left", "Right"])
+    add.add_argument("--note", type=int)
+    add.add_argument("--max-dist", type=float, help=f"widest per-template cutoff (default {MAX_DIST})")
+    add.add_argument("--every", type=int, default=3, help="use every Nth frame")
+    lst = sub.add_parser("list")
+    lst.add_argument("path")
+    args = parser.parse_args()
+
+    if args.cmd == "record":
+        record(args.path, args.name, frames=args.frames, camera=args.camera,
+               hand=args.hand, note=args.note, max_dist=args.max_dist)
+    elif args.cmd == "add":
+        add_recording(args.path, args.name, args.take, hand=args.hand, note=args.note,
+                      max_dist=args.max_dist, every=args.every)
+    else:
+        index = TemplateIndex.load(args.path)
+        print(f"[Templates] {len(index)} samples, max_dist={index.max_dist:.2f}")
+        for (name, n), cutoff in zip(index.counts().items(), index.cutoffs):
+            note = index.notes.get(name)
+            print(f"  {name:<20} {n:>4} samples  cutoff {cutoff:.3f}"
+                  + (f"  note {note}" if note is not None else ""))
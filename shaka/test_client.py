@@ -18,8 +18,13 @@ async def test_client():
                     data = json.loads(message)
                     
                     if data.get("type") == "gesture":
-                        print(f"🎭 GESTURE: {data['name']} (confidence: {data['conf']:.2f})")
+                        who = f"[{data['session']}] " if "session" in data else ""
+                        print(f"🎭 GESTURE: {who}{data['hand']} {data['gesture']} "
+                              f"(fingers: {data['fingers']}, volume: {data['volume']})")
                     
+                    elif data.get("type") in ("frame", "snapshot"):
+                        print(f"🎭 {data['type'].upper()} #{data['seq']}: {data['hands']}")
+
                     elif data.get("type") == "action":
                         print(f"🎵 ACTION: {data['name']}")
                         if 'value' in data:
@@ -40,7 +45,7 @@ async def test_client():
                     print(f" Error: {e}")
                     break
                     
-    except ConnectionRefused:
+    except ConnectionRefusedError:
         print(" Could not connect to WebSocket server")
         print("Make sure run_time.py is running first!")
     except Exception as e: